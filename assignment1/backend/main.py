@@ -306,7 +306,7 @@ async def add_to_cart(item: CartItem, session_id: Optional[str] = None):
         # Update quantity
         cursor.execute('''
             UPDATE cart_items
-            SET quantity = quantity + ?, updated_at = CURRENT_TIMESTAMP
+            SET quantity = quantity + ?
             WHERE id = ?
         ''', (item.quantity, existing_item['id']))
     else:
@@ -397,7 +397,7 @@ async def update_item_quantity(item_id: int, quantity: int, session_id: Optional
     # Update quantity
     cursor.execute('''
         UPDATE cart_items
-        SET quantity = ?, updated_at = CURRENT_TIMESTAMP
+        SET quantity = ?
         WHERE id = ?
     ''', (quantity, item_id))
 
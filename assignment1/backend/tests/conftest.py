@@ -6,7 +6,13 @@ import os
 from typing import Generator, Dict, Any
 from unittest.mock import Mock, AsyncMock
 from fastapi.testclient import TestClient
-from main import app
+
+
+@pytest.fixture(scope="session")
+def app():
+    """FastAPI app, imported on first use rather than at collection time"""
+    from main import app as _app
+    return _app
 
 
 @pytest.fixture(scope="session")
@@ -89,7 +95,7 @@ def test_db(test_db_path: str) -> Generator[sqlite3.Connection, None, None]:
 
 
 @pytest.fixture
-def test_client(test_db_path: str) -> TestClient:
+def test_client(app, test_db_path: str) -> TestClient:
     """Create test client with mocked database"""
     with pytest.MonkeyPatch().context() as m:
         def mock_get_db_connection():
@@ -289,7 +295,7 @@ def boundary_test_data() -> Dict[str, Dict[str, Any]]:
 
 # Async fixtures for async testing
 @pytest_asyncio.fixture
-async def async_test_client(test_db_path: str) -> TestClient:
+async def async_test_client(app, test_db_path: str) -> TestClient:
     """Create async test client with mocked database"""
     with pytest.MonkeyPatch().context() as m:
         def mock_get_db_connection():
@@ -1,142 +1,208 @@
 import pytest
 import pytest_asyncio
-from fastapi.testclient import TestClient
-from main import app
+from httpx import AsyncClient, ASGITransport
 import json
+import os
 import sqlite3
-from unittest.mock import patch, AsyncMock
-
-client = TestClient(app)
+from unittest.mock import AsyncMock
+from types import MappingProxyType
+
+# Test schema and seed data, run as one script
+_SCHEMA_SQL = """
+    CREATE TABLE cart_sessions (
+        id TEXT PRIMARY KEY,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE cart_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT,
+        product_id TEXT,
+        product_name TEXT,
+        price REAL,
+        quantity INTEGER,
+        vendor_id TEXT,
+        vendor_name TEXT,
+        image_url TEXT,
+        FOREIGN KEY (session_id) REFERENCES cart_sessions (id)
+    );
+    CREATE TABLE discount_codes (
+        code TEXT PRIMARY KEY,
+        percentage REAL CHECK (percentage >= 0 AND percentage <= 100),
+        is_active BOOLEAN DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE product_service_config (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        endpoint TEXT,
+        api_key TEXT,
+        headers TEXT,
+        is_active BOOLEAN DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    INSERT INTO discount_codes (code, percentage) VALUES
+        ('SAVE10', 10.0),
+        ('SAVE20', 20.0);
+    INSERT INTO product_service_config (endpoint, headers)
+        VALUES ('https://api.example.com/products', '{}');
+"""
+
+# Every test drives the app in-process through the async client
+pytestmark = pytest.mark.asyncio
+
+@pytest_asyncio.fixture
+async def ac(app):
+    """Async client calling the ASGI app directly, without a portal thread per request"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+class _SharedConnection(sqlite3.Connection):
+    """Connection handed to the app; its commit() and close() leave the per-test savepoint open"""
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+# Anchor connection for the shared in-memory database; the database lives as long as it is open
+_SCHEMA_CONN = None
+
+@pytest.fixture(scope="session")
+def _test_schema():
+    """Create the in-memory test database and seed it once per session (one per xdist worker)"""
+    global _SCHEMA_CONN
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    uri = f"file:testdb_{worker}?mode=memory&cache=shared"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False, factory=_SharedConnection)
+    conn.row_factory = sqlite3.Row
+    # Throwaway database: no write barriers, rollback journal and temp tables kept in memory
+    conn.executescript("PRAGMA synchronous=OFF; PRAGMA journal_mode=MEMORY; PRAGMA temp_store=MEMORY;")
+    conn.executescript(_SCHEMA_SQL)
+    _SCHEMA_CONN = conn
+
+    yield conn
+
+    _SCHEMA_CONN = None
+    sqlite3.Connection.close(conn)
 
 @pytest.fixture(scope="function")
-def test_db():
-    """Create a test database and clean up after tests"""
-    # Create test database
-    conn = sqlite3.connect(':memory:')  # In-memory database for testing
-    conn.execute('''
-        CREATE TABLE cart_sessions (
-            id TEXT PRIMARY KEY,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.execute('''
-        CREATE TABLE cart_items (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_id TEXT,
-            product_id TEXT,
-            product_name TEXT,
-            price REAL,
-            quantity INTEGER,
-            vendor_id TEXT,
-            vendor_name TEXT,
-            image_url TEXT,
-            FOREIGN KEY (session_id) REFERENCES cart_sessions (id)
-        )
-    ''')
-    conn.execute('''
-        CREATE TABLE discount_codes (
-            code TEXT PRIMARY KEY,
-            percentage REAL CHECK (percentage >= 0 AND percentage <= 100),
-            is_active BOOLEAN DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.execute('''
-        CREATE TABLE product_service_config (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            endpoint TEXT,
-            api_key TEXT,
-            headers TEXT,
-            is_active BOOLEAN DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.execute('''
-        INSERT INTO discount_codes (code, percentage) VALUES
-        ('SAVE10', 10.0),
-        ('SAVE20', 20.0)
-    ''')
-    conn.execute('''
-        INSERT INTO product_service_config (endpoint, headers)
-        VALUES ('https://api.example.com/products', '{}')
-    ''')
-    conn.commit()
-    conn.close()
-
-    # Apply the test database configuration to the app
-    with patch('main.get_db_connection') as mock_get_db:
-        def mock_db():
-            test_conn = sqlite3.connect(':memory:')
-            test_conn.row_factory = sqlite3.Row
-            return test_conn
-        mock_get_db.side_effect = mock_db
-
-    yield
-
-    # Clean up - the in-memory database will be garbage collected
+def test_db(mocker, _test_schema):
+    """Run each test inside a savepoint on the shared database and roll it back afterwards"""
+    conn = _test_schema
+    conn.execute("SAVEPOINT test_sp")
+
+    # Point the app at the shared connection for the whole test
+    mocker.patch('main.get_db_connection', return_value=conn)
+
+    yield conn
+
+    conn.execute("ROLLBACK TO SAVEPOINT test_sp")
+    conn.execute("RELEASE SAVEPOINT test_sp")
+
+@pytest.fixture
+def mock_fetch(mocker):
+    """Patch the external product lookup; tests set return_value or side_effect"""
+    return mocker.patch('main.fetch_product_from_external_api', new_callable=AsyncMock)
+
+# Request bodies serialized once at import; sent with content= and _JSON_HEADERS
+_JSON_HEADERS = {"content-type": "application/json"}
+_ADD_PROD001_Q2 = json.dumps({"product_id": "prod_001", "quantity": 2}).encode()
+_ADD_PROD001_Q5 = json.dumps({"product_id": "prod_001", "quantity": 5}).encode()  # More than the stock below
+_ADD_UNKNOWN_Q1 = json.dumps({"product_id": "non_existent", "quantity": 1}).encode()
+_DISCOUNT_SAVE10 = json.dumps({"code": "SAVE10"}).encode()
+_DISCOUNT_INVALID = json.dumps({"code": "INVALID"}).encode()
+_PRODUCT_SERVICE_CONFIG = json.dumps({
+    "endpoint": "https://api.example.com/products",
+    "api_key": "test_key",
+    "headers": {"Authorization": "Bearer test"}
+}).encode()
+
+_BASE_PRODUCT = MappingProxyType({
+    "id": "prod_001",
+    "name": "Test Product",
+    "price": 99.99,
+    "stock": 50,
+    "vendor_id": "vendor_001",
+    "vendor_name": "Vendor A",
+    "image_url": "https://example.com/image.jpg"
+})
+
+_INSERT_CART_ITEM_SQL = '''
+    INSERT INTO cart_items (
+        session_id, product_id, product_name, price, quantity,
+        vendor_id, vendor_name, image_url
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def _cart_item_row(session_id, product, quantity):
+    return (
+        session_id,
+        product["id"],
+        product["name"],
+        product["price"],
+        quantity,
+        product["vendor_id"],
+        product["vendor_name"],
+        product.get("image_url")
+    )
+
+def _seed_cart_item(conn, session_id, quantity=1, product=_BASE_PRODUCT):
+    """Insert a cart session and one item straight into the test database; returns the item id"""
+    conn.execute("INSERT OR IGNORE INTO cart_sessions (id) VALUES (?)", (session_id,))
+    cursor = conn.execute(_INSERT_CART_ITEM_SQL, _cart_item_row(session_id, product, quantity))
+    return cursor.lastrowid
+
+def _seed_cart_items(conn, session_id, products, quantity=1):
+    """Insert a cart session and one item per product in a single executemany"""
+    conn.execute("INSERT OR IGNORE INTO cart_sessions (id) VALUES (?)", (session_id,))
+    conn.executemany(_INSERT_CART_ITEM_SQL, [
+        _cart_item_row(session_id, product, quantity) for product in products
+    ])
 
 @pytest.fixture
 def sample_product_data():
-    return {
-        "id": "prod_001",
-        "name": "Test Product",
-        "price": 99.99,
-        "stock": 50,
-        "vendor_id": "vendor_001",
-        "vendor_name": "Vendor A",
-        "image_url": "https://example.com/image.jpg"
-    }
-
-@pytest.mark.asyncio
-async def test_add_to_cart_success(test_db, sample_product_data):
+    """Mutable copy of the sample product for tests that change it"""
+    return dict(_BASE_PRODUCT)
+
+@pytest.fixture
+def sample_product_data_ro():
+    """Read-only sample product shared by every test"""
+    return _BASE_PRODUCT
+
+async def test_add_to_cart_success(ac, mock_fetch, test_db, sample_product_data_ro):
     """Test successfully adding item to cart"""
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        mock_fetch.return_value = sample_product_data
+    mock_fetch.return_value = sample_product_data_ro
 
-        response = client.post("/api/v1/cart/items", json={
-            "product_id": "prod_001",
-            "quantity": 2
-        })
+    response = await ac.post("/api/v1/cart/items", content=_ADD_PROD001_Q2, headers=_JSON_HEADERS)
 
-        assert response.status_code == 200
-        data = response.json()
-        assert "Item added to cart" in data["message"]
-        assert "session_id" in data
+    assert response.status_code == 200
+    data = response.json()
+    assert "Item added to cart" in data["message"]
+    assert "session_id" in data
 
-@pytest.mark.asyncio
-async def test_add_to_cart_product_not_found(test_db):
+async def test_add_to_cart_product_not_found(ac, mock_fetch, test_db):
     """Test adding non-existent product to cart"""
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        mock_fetch.return_value = None
+    mock_fetch.return_value = None
 
-        response = client.post("/api/v1/cart/items", json={
-            "product_id": "non_existent",
-            "quantity": 1
-        })
+    response = await ac.post("/api/v1/cart/items", content=_ADD_UNKNOWN_Q1, headers=_JSON_HEADERS)
 
-        assert response.status_code == 404
-        assert "Product not found" in response.json()["detail"]
+    assert response.status_code == 404
+    assert "Product not found" in response.json()["detail"]
 
-@pytest.mark.asyncio
-async def test_add_to_cart_insufficient_stock(test_db, sample_product_data):
+async def test_add_to_cart_insufficient_stock(ac, mock_fetch, test_db, sample_product_data):
     """Test adding item with insufficient stock"""
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        sample_product_data["stock"] = 1
-        mock_fetch.return_value = sample_product_data
+    sample_product_data["stock"] = 1
+    mock_fetch.return_value = sample_product_data
 
-        response = client.post("/api/v1/cart/items", json={
-            "product_id": "prod_001",
-            "quantity": 5  # Request more than available stock
-        })
+    response = await ac.post("/api/v1/cart/items", content=_ADD_PROD001_Q5, headers=_JSON_HEADERS)
 
-        assert response.status_code == 400
-        assert "Insufficient stock" in response.json()["detail"]
+    assert response.status_code == 400
+    assert "Insufficient stock" in response.json()["detail"]
 
-@pytest.mark.asyncio
-async def test_get_cart_empty(test_db):
+async def test_get_cart_empty(ac, test_db):
     """Test getting empty cart"""
-    response = client.get("/api/v1/cart")
+    response = await ac.get("/api/v1/cart")
     assert response.status_code == 200
     data = response.json()
     assert data["items"] == []
@@ -145,319 +211,169 @@ async def test_get_cart_empty(test_db):
     assert data["shipping"] == 0.0
     assert data["total"] == 0.0
 
-@pytest.mark.asyncio
-async def test_get_cart_with_items(test_db, sample_product_data):
+async def test_get_cart_with_items(ac, mock_fetch, test_db, sample_product_data_ro):
     """Test getting cart with items"""
     # First add item to cart
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        mock_fetch.return_value = sample_product_data
-
-        add_response = client.post("/api/v1/cart/items", json={
-            "product_id": "prod_001",
-            "quantity": 2
-        })
-        session_id = add_response.json()["session_id"]
-
-        # Now get cart
-        response = client.get(f"/api/v1/cart?session_id={session_id}")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["items"]) == 1
-        assert data["items"][0]["product_id"] == "prod_001"
-        assert data["items"][0]["quantity"] == 2
-        assert data["subtotal"] == 199.98  # 99.99 * 2
-        assert data["items"][0]["vendor_id"] == "vendor_001"
-
-@pytest.mark.asyncio
-async def test_update_item_quantity(test_db, sample_product_data):
-    """Test updating item quantity"""
-    # Add item first
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        mock_fetch.return_value = sample_product_data
+    mock_fetch.return_value = sample_product_data_ro
 
-        add_response = client.post("/api/v1/cart/items", json={
-            "product_id": "prod_001",
-            "quantity": 1
-        })
-        session_id = add_response.json()["session_id"]
+    add_response = await ac.post("/api/v1/cart/items", content=_ADD_PROD001_Q2, headers=_JSON_HEADERS)
+    session_id = add_response.json()["session_id"]
+
+    # Now get cart
+    response = await ac.get(f"/api/v1/cart?session_id={session_id}")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) == 1
+    assert data["items"][0]["product_id"] == "prod_001"
+    assert data["items"][0]["quantity"] == 2
+    assert data["subtotal"] == 199.98  # 99.99 * 2
+    assert data["items"][0]["vendor_id"] == "vendor_001"
 
-        # Get cart to find item ID
-        cart_response = client.get(f"/api/v1/cart?session_id={session_id}")
-        item_id = cart_response.json()["items"][0]["id"]
+async def test_update_item_quantity(ac, mock_fetch, test_db, sample_product_data_ro):
+    """Test updating item quantity"""
+    # Seed item; the endpoint re-checks stock through the product lookup
+    mock_fetch.return_value = sample_product_data_ro
+    session_id = "test_session"
+    item_id = _seed_cart_item(test_db, session_id)
 
-        # Update quantity
-        response = client.put(f"/api/v1/cart/items/{item_id}?session_id={session_id}", json={"quantity": 5})
+    # Update quantity
+    response = await ac.put(f"/api/v1/cart/items/{item_id}", params={"session_id": session_id, "quantity": 5})
 
-        assert response.status_code == 200
-        assert "Quantity updated" in response.json()["message"]
+    assert response.status_code == 200
+    assert "Quantity updated" in response.json()["message"]
 
-        # Verify update
-        cart_response = client.get(f"/api/v1/cart?session_id={session_id}")
-        assert cart_response.json()["items"][0]["quantity"] == 5
+    # Verify update straight from the database
+    quantity, = test_db.execute("SELECT quantity FROM cart_items WHERE id = ?", (item_id,)).fetchone()
+    assert quantity == 5
 
-@pytest.mark.asyncio
-async def test_update_item_quantity_invalid(test_db, sample_product_data):
+@pytest.mark.parametrize("quantity, status, detail", [
+    pytest.param(0, 400, "Quantity must be at least 1", id="zero"),
+    pytest.param(51, 400, "Insufficient stock", id="above-stock"),
+])
+async def test_update_item_quantity_invalid(ac, mock_fetch, test_db, sample_product_data_ro, quantity, status, detail):
     """Test updating item quantity with invalid values"""
-    # Add item first
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        mock_fetch.return_value = sample_product_data
-
-        add_response = client.post("/api/v1/cart/items", json={
-            "product_id": "prod_001",
-            "quantity": 1
-        })
-        session_id = add_response.json()["session_id"]
-
-        # Get cart to find item ID
-        cart_response = client.get(f"/api/v1/cart?session_id={session_id}")
-        item_id = cart_response.json()["items"][0]["id"]
-
-        # Try to update with quantity 0
-        response = client.put(f"/api/v1/cart/items/{item_id}?session_id={session_id}", json={"quantity": 0})
-        assert response.status_code == 400
-        assert "Quantity must be at least 1" in response.json()["detail"]
-
-@pytest.mark.asyncio
-async def test_remove_item(test_db, sample_product_data):
+    # Seed item; the endpoint re-checks stock through the product lookup
+    mock_fetch.return_value = sample_product_data_ro
+    session_id = "test_session"
+    item_id = _seed_cart_item(test_db, session_id)
+
+    # Try to update with an invalid quantity
+    response = await ac.put(f"/api/v1/cart/items/{item_id}", params={"session_id": session_id, "quantity": quantity})
+    assert response.status_code == status
+    assert detail in response.json()["detail"]
+
+async def test_remove_item(ac, test_db):
     """Test removing item from cart"""
-    # Add item first
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        mock_fetch.return_value = sample_product_data
-
-        add_response = client.post("/api/v1/cart/items", json={
-            "product_id": "prod_001",
-            "quantity": 1
-        })
-        session_id = add_response.json()["session_id"]
-
-        # Get cart to find item ID
-        cart_response = client.get(f"/api/v1/cart?session_id={session_id}")
-        item_id = cart_response.json()["items"][0]["id"]
-
-        # Remove item
-        response = client.delete(f"/api/v1/cart/items/{item_id}?session_id={session_id}")
-        assert response.status_code == 200
-        assert "Item removed" in response.json()["message"]
-
-        # Verify item is removed
-        cart_response = client.get(f"/api/v1/cart?session_id={session_id}")
-        assert len(cart_response.json()["items"]) == 0
-
-@pytest.mark.asyncio
-async def test_clear_cart(test_db, sample_product_data):
+    # Seed item
+    session_id = "test_session"
+    item_id = _seed_cart_item(test_db, session_id)
+
+    # Remove item
+    response = await ac.delete(f"/api/v1/cart/items/{item_id}?session_id={session_id}")
+    assert response.status_code == 200
+    assert "Item removed" in response.json()["message"]
+
+    # Verify item is removed
+    count, = test_db.execute("SELECT COUNT(*) FROM cart_items WHERE session_id = ?", (session_id,)).fetchone()
+    assert count == 0
+
+async def test_clear_cart(ac, test_db):
     """Test clearing entire cart"""
-    # Add some items first
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        mock_fetch.return_value = sample_product_data
-
-        add_response = client.post("/api/v1/cart/items", json={
-            "product_id": "prod_001",
-            "quantity": 1
-        })
-        session_id = add_response.json()["session_id"]
-
-        # Clear cart
-        response = client.delete(f"/api/v1/cart?session_id={session_id}")
-        assert response.status_code == 200
-        assert "Cart cleared" in response.json()["message"]
-
-        # Verify cart is empty
-        cart_response = client.get(f"/api/v1/cart?session_id={session_id}")
-        assert len(cart_response.json()["items"]) == 0
-
-@pytest.mark.asyncio
-async def test_apply_discount_code(test_db, sample_product_data):
+    # Seed an item
+    session_id = "test_session"
+    _seed_cart_item(test_db, session_id)
+
+    # Clear cart
+    response = await ac.delete(f"/api/v1/cart?session_id={session_id}")
+    assert response.status_code == 200
+    assert "Cart cleared" in response.json()["message"]
+
+    # Verify cart is empty
+    count, = test_db.execute("SELECT COUNT(*) FROM cart_items WHERE session_id = ?", (session_id,)).fetchone()
+    assert count == 0
+
+@pytest.fixture
+def discount_session(test_db):
+    """Session holding prod_001 x10 ($999.90), seeded directly for the discount tests"""
+    session_id = "discount_session"
+    _seed_cart_item(test_db, session_id, quantity=10)
+    return session_id
+
+async def test_apply_discount_code(ac, discount_session):
     """Test applying discount code"""
-    # Add item to cart
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        mock_fetch.return_value = sample_product_data
-
-        add_response = client.post("/api/v1/cart/items", json={
-            "product_id": "prod_001",
-            "quantity": 10  # $999.90 total
-        })
-        session_id = add_response.json()["session_id"]
-
-        # Apply discount
-        response = client.post(f"/api/v1/cart/discount?session_id={session_id}", json={"code": "SAVE10"})
-        assert response.status_code == 200
-        data = response.json()
-        assert "Discount code applied" in data["message"]
-        assert data["code"] == "SAVE10"
-        assert data["discount_amount"] == 99.99  # 10% of 999.90
-
-@pytest.mark.asyncio
-async def test_apply_invalid_discount_code(test_db, sample_product_data):
+    response = await ac.post(f"/api/v1/cart/discount?session_id={discount_session}", content=_DISCOUNT_SAVE10, headers=_JSON_HEADERS)
+    assert response.status_code == 200
+    data = response.json()
+    assert "Discount code applied" in data["message"]
+    assert data["code"] == "SAVE10"
+    assert data["discount_amount"] == 99.99  # 10% of 999.90
+
+async def test_apply_invalid_discount_code(ac, discount_session):
     """Test applying invalid discount code"""
-    # Add item to cart
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        mock_fetch.return_value = sample_product_data
-
-        add_response = client.post("/api/v1/cart/items", json={
-            "product_id": "prod_001",
-            "quantity": 1
-        })
-        session_id = add_response.json()["session_id"]
-
-        # Apply invalid discount
-        response = client.post(f"/api/v1/cart/discount?session_id={session_id}", json={"code": "INVALID"})
-        assert response.status_code == 404
-        assert "Invalid discount code" in response.json()["detail"]
-
-@pytest.mark.asyncio
-async def test_remove_discount_code(test_db, sample_product_data):
+    response = await ac.post(f"/api/v1/cart/discount?session_id={discount_session}", content=_DISCOUNT_INVALID, headers=_JSON_HEADERS)
+    assert response.status_code == 404
+    assert "Invalid discount code" in response.json()["detail"]
+
+async def test_remove_discount_code(ac, discount_session):
     """Test removing discount code"""
-    # Add item and apply discount
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        mock_fetch.return_value = sample_product_data
-
-        add_response = client.post("/api/v1/cart/items", json={
-            "product_id": "prod_001",
-            "quantity": 10
-        })
-        session_id = add_response.json()["session_id"]
-
-        client.post(f"/api/v1/cart/discount?session_id={session_id}", json={"code": "SAVE10"})
-
-        # Remove discount
-        response = client.delete(f"/api/v1/cart/discount?session_id={session_id}")
-        assert response.status_code == 200
-        assert "Discount code removed" in response.json()["message"]
-
-@pytest.mark.asyncio
-async def test_shipping_calculation_multiple_vendors(test_db):
-    """Test shipping calculation with multiple vendors"""
-    # Mock product data for two vendors
-    product_a = {
-        "id": "prod_a",
-        "name": "Product A",
-        "price": 900,  # Above $800 threshold
-        "stock": 10,
-        "vendor_id": "vendor_001",
-        "vendor_name": "Vendor A"
-    }
-
-    product_b = {
-        "id": "prod_b",
-        "name": "Product B",
-        "price": 500,  # Below $800 threshold
-        "stock": 10,
-        "vendor_id": "vendor_002",
-        "vendor_name": "Vendor B"
-    }
-
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        # Mock responses for different product IDs
-        async def mock_fetch_side_effect(product_id):
-            if product_id == "prod_a":
-                return product_a
-            elif product_id == "prod_b":
-                return product_b
-            return None
-
-        mock_fetch.side_effect = mock_fetch_side_effect
-
-        # Add items from both vendors
-        add_response = client.post("/api/v1/cart/items", json={
-            "product_id": "prod_a",
-            "quantity": 1
-        })
-        session_id = add_response.json()["session_id"]
-
-        client.post("/api/v1/cart/items", json={
-            "product_id": "prod_b",
-            "quantity": 1,
-            "session_id": session_id
-        })
-
-        # Get cart totals
-        response = client.get(f"/api/v1/cart?session_id={session_id}")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["subtotal"] == 1400.0  # 900 + 500
-        assert data["shipping"] == 100.0   # 0 (vendor A) + 100 (vendor B)
-        assert data["total"] == 1500.0     # 1400 + 100
-
-@pytest.mark.asyncio
-async def test_configure_product_service(test_db):
-    """Test configuring external product service"""
-    config = {
-        "endpoint": "https://api.example.com/products",
-        "api_key": "test_key",
-        "headers": {"Authorization": "Bearer test"}
-    }
-
-    response = client.post("/api/v1/config/product-service", json=config)
+    await ac.post(f"/api/v1/cart/discount?session_id={discount_session}", content=_DISCOUNT_SAVE10, headers=_JSON_HEADERS)
+
+    # Remove discount
+    response = await ac.delete(f"/api/v1/cart/discount?session_id={discount_session}")
+    assert response.status_code == 200
+    assert "Discount code removed" in response.json()["message"]
+
+VENDOR_SHIPPING_CASES = [
+    pytest.param(
+        [
+            {"id": "prod_a", "name": "Product A", "price": 900, "stock": 10,  # Above $800 threshold
+             "vendor_id": "vendor_001", "vendor_name": "Vendor A"},
+            {"id": "prod_b", "name": "Product B", "price": 500, "stock": 10,  # Below $800 threshold
+             "vendor_id": "vendor_002", "vendor_name": "Vendor B"},
+        ],
+        1400.0, 100.0,  # 0 (vendor A) + 100 (vendor B)
+        id="900-and-500"
+    ),
+    pytest.param(
+        [
+            {"id": "prod_high", "name": "High Value Product", "price": 850, "stock": 10,  # Above $800
+             "vendor_id": "vendor_high", "vendor_name": "Vendor High"},
+            {"id": "prod_low", "name": "Low Value Product", "price": 750, "stock": 10,  # Below $800
+             "vendor_id": "vendor_low", "vendor_name": "Vendor Low"},
+        ],
+        1600.0, 100.0,  # 0 (vendor high) + 100 (vendor low)
+        id="850-and-750"
+    ),
+]
+
+@pytest.mark.parametrize("products, expected_subtotal, expected_shipping", VENDOR_SHIPPING_CASES)
+async def test_vendor_shipping(ac, test_db, products, expected_subtotal, expected_shipping):
+    """Test vendor-based shipping: $0 for vendor subtotals >= $800, $100 otherwise"""
+    # Seed one item from each vendor
+    session_id = "vendor_session"
+    _seed_cart_items(test_db, session_id, products)
+
+    # Check totals
+    response = await ac.get(f"/api/v1/cart?session_id={session_id}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["subtotal"] == expected_subtotal
+    assert data["shipping"] == expected_shipping
+    assert data["total"] == expected_subtotal + expected_shipping
+
+async def test_product_service_config_roundtrip(ac, test_db):
+    """Test configuring the external product service and reading the configuration back"""
+    response = await ac.post("/api/v1/config/product-service", content=_PRODUCT_SERVICE_CONFIG, headers=_JSON_HEADERS)
     assert response.status_code == 200
     assert "Product service configured successfully" in response.json()["message"]
 
-@pytest.mark.asyncio
-async def test_get_product_service_config(test_db):
-    """Test getting product service configuration"""
-    response = client.get("/api/v1/config/product-service")
+    response = await ac.get("/api/v1/config/product-service")
     assert response.status_code == 200
-    data = response.json()
-    assert "endpoint" in data
-    assert "headers" in data
+    assert response.json() == json.loads(_PRODUCT_SERVICE_CONFIG)
 
-def test_root_endpoint():
+async def test_root_endpoint(ac):
     """Test root endpoint"""
-    response = client.get("/")
+    response = await ac.get("/")
     assert response.status_code == 200
     assert "Shopping Cart API is running" in response.json()["message"]
 
-@pytest.mark.asyncio
-async def test_vendor_based_shipping_rules(test_db):
-    """Test vendor-based shipping calculation rules"""
-    # Test case 1: Vendor subtotal >= $800 should have $0 shipping
-    product_high_value = {
-        "id": "prod_high",
-        "name": "High Value Product",
-        "price": 850,  # Above $800
-        "stock": 10,
-        "vendor_id": "vendor_high",
-        "vendor_name": "Vendor High"
-    }
-
-    product_low_value = {
-        "id": "prod_low",
-        "name": "Low Value Product",
-        "price": 750,  # Below $800
-        "stock": 10,
-        "vendor_id": "vendor_low",
-        "vendor_name": "Vendor Low"
-    }
-
-    with patch('main.fetch_product_from_external_api', new_callable=AsyncMock) as mock_fetch:
-        def mock_fetch_side_effect(product_id):
-            if product_id == "prod_high":
-                return product_high_value
-            elif product_id == "prod_low":
-                return product_low_value
-            return None
-
-        mock_fetch.side_effect = mock_fetch_side_effect
-
-        # Add one item from each vendor
-        response = client.post("/api/v1/cart/items", json={
-            "product_id": "prod_high",
-            "quantity": 1
-        })
-        session_id = response.json()["session_id"]
-
-        client.post("/api/v1/cart/items", json={
-            "product_id": "prod_low",
-            "quantity": 1,
-            "session_id": session_id
-        })
-
-        # Check totals
-        cart_response = client.get(f"/api/v1/cart?session_id={session_id}")
-        data = cart_response.json()
-
-        # High vendor: $850 subtotal, should have $0 shipping
-        # Low vendor: $750 subtotal, should have $100 shipping
-        # Total shipping: $100
-        assert data["shipping"] == 100.0
-        assert data["subtotal"] == 1600.0  # 850 + 750
-        assert data["total"] == 1700.0     # 1600 + 100
\ No newline at end of file
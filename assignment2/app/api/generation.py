@@ -7,7 +7,7 @@ from typing import List
 from app.models.database import get_db, GenerationTask, Template, AIProvider
 from app.services.template_service import TemplateService
 from app.services.quality_service import QualityService
-from app.core.providers import ProviderFactory, GenerationRequest, GenerationResponse
+from app.core.providers import ProviderFactory, ProviderConfig, GenerationRequest, GenerationResponse
 from app.api.schemas import (
     GenerationRequest as GenerationRequestSchema,
     BatchGenerationRequest,
@@ -111,20 +111,18 @@ async def generate_content_batch(
         request.provider_id = provider.id
 
     # Create generation tasks for each input
-    task_ids = []
-    for input_data in request.input_data_list:
-        task_id = str(uuid.uuid4())
-        task = GenerationTask(
-            task_id=task_id,
-            template_id=request.template_id,
-            provider_id=request.provider_id,
-            input_data=input_data,
-            status="pending"
-        )
-        db.add(task)
-        task_ids.append(task_id)
-
-    db.commit()
+    tasks = [
+        {
+            "task_id": str(uuid.uuid4()),
+            "template_id": request.template_id,
+            "provider_id": request.provider_id,
+            "input_data": input_data,
+            "status": "pending"
+        }
+        for input_data in request.input_data_list
+    ]
+    template_service.bulk_create_tasks(tasks)
+    task_ids = [task["task_id"] for task in tasks]
 
     # Run generation tasks in parallel (with concurrency limit)
     await asyncio.gather(*[_run_generation_task(task_id, db) for task_id in task_ids])
@@ -199,7 +197,6 @@ async def _run_generation_task(task_id: str, db: Session):
         # Create provider instance
         provider_config = None
         if provider.provider_type == "openai":
-            from app.core.providers import ProviderConfig
             provider_config = ProviderConfig(
                 name=provider.name,
                 provider_type=provider.provider_type,
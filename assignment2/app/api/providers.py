@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
+import time
 
 from app.models.database import get_db, AIProvider
 from app.core.providers import ProviderConfig, ProviderFactory
@@ -155,7 +156,6 @@ async def test_provider_connection(
         provider_instance = ProviderFactory.create_provider(config)
 
         # Test connection
-        import time
         start_time = time.time()
         is_connected = await provider_instance.test_connection()
         response_time = time.time() - start_time
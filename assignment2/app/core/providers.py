@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, FrozenSet
 from pydantic import BaseModel
 import time
 import asyncio
@@ -47,6 +47,7 @@ class QualityCheckResult(BaseModel):
     score: int  # 0-100
     issues: List[str]
     suggestions: List[str]
+    issue_codes: FrozenSet[str] = frozenset()  # Stable identifiers for the issues above
 
 
 class AIProvider(ABC):
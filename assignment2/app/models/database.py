@@ -120,6 +120,13 @@ def get_db():
         db.close()
 
 
+_tables_created = False
+
+
 def create_tables():
-    """Create database tables"""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    """Create database tables (only once per process)"""
+    global _tables_created
+    if _tables_created:
+        return
+    Base.metadata.create_all(bind=engine)
+    _tables_created = True
\ No newline at end of file
@@ -11,20 +11,24 @@ class QualityService:
     def check_content_quality(content: str, template_rules: Dict[str, Any]) -> QualityCheckResult:
         """Check content quality against template rules"""
         issues = []
+        issue_codes = set()
         suggestions = []
         score = 100
 
         # Basic content validation
         if not content or not content.strip():
             issues.append("Content is empty")
+            issue_codes.add("CONTENT_EMPTY")
             score -= 50
         else:
             content_length = len(content.strip())
             if content_length < 10:
                 issues.append("Content is too short")
+                issue_codes.add("CONTENT_TOO_SHORT")
                 score -= 20
             elif content_length > 10000:
                 issues.append("Content is extremely long")
+                issue_codes.add("CONTENT_TOO_LONG")
                 score -= 10
 
         # Check JSON format if expected
@@ -34,6 +38,7 @@ class QualityService:
                 score += 10  # Bonus for valid JSON
             except json.JSONDecodeError:
                 issues.append("Content is not valid JSON")
+                issue_codes.add("INVALID_JSON")
                 score -= 30
                 suggestions.append("Ensure content is properly formatted JSON")
 
@@ -47,6 +52,7 @@ class QualityService:
                         for field in template_rules["required_fields"]:
                             if field not in parsed_content:
                                 issues.append(f"Missing required field: {field}")
+                                issue_codes.add("MISSING_REQUIRED_FIELD")
                                 score -= 15
                     except json.JSONDecodeError:
                         pass  # Already handled above
@@ -58,6 +64,7 @@ class QualityService:
                     if "classification" in parsed_content:
                         if parsed_content["classification"] not in template_rules["valid_classifications"]:
                             issues.append(f"Invalid classification: {parsed_content['classification']}")
+                            issue_codes.add("INVALID_CLASSIFICATION")
                             score -= 20
                 except json.JSONDecodeError:
                     pass
@@ -70,6 +77,7 @@ class QualityService:
                         min_conf, max_conf = template_rules["confidence_range"]
                         if not (min_conf <= parsed_content["confidence"] <= max_conf):
                             issues.append(f"Confidence out of range: {parsed_content['confidence']}")
+                            issue_codes.add("CONFIDENCE_OUT_OF_RANGE")
                             score -= 15
                 except json.JSONDecodeError:
                     pass
@@ -83,6 +91,7 @@ class QualityService:
                         max_length = template_rules["max_reasoning_length"]
                         if reasoning_length > max_length:
                             issues.append(f"Reasoning too long: {reasoning_length} characters")
+                            issue_codes.add("REASONING_TOO_LONG")
                             score -= 10
                             suggestions.append(f"Shorten reasoning to {max_length} characters or less")
                 except json.JSONDecodeError:
@@ -111,7 +120,8 @@ class QualityService:
             is_valid=score >= 70,  # Consider valid if score >= 70
             score=score,
             issues=formatted_issues,
-            suggestions=formatted_suggestions
+            suggestions=formatted_suggestions,
+            issue_codes=frozenset(issue_codes)
         )
 
     @staticmethod
@@ -1,10 +1,28 @@
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
+import string
 import uuid
+from functools import lru_cache
 from app.models.database import Template, GenerationTask
 from app.core.providers import GenerationRequest
 import json
 
+_FORMATTER = string.Formatter()
+
+
+def _placeholder_names(template: str) -> List[str]:
+    """Variable names str.format looks up in a prompt; {{escaped}} braces are skipped"""
+    names = []
+    try:
+        for _, field_name, _, _ in _FORMATTER.parse(template):
+            if field_name:
+                # {name.attr}, {name[0]}, {name!r} and {name:fmt} all look up "name"
+                names.append(field_name.split(".", 1)[0].split("[", 1)[0])
+    except ValueError:
+        # Malformed braces are reported when the prompt is substituted
+        pass
+    return names
+
 
 class TemplateService:
     """Service for managing AI templates"""
@@ -70,6 +88,10 @@ class TemplateService:
         if not template:
             raise ValueError(f"Template with ID {template_id} not found")
 
+        missing = [name for name in _placeholder_names(template.user_prompt_template) if name not in input_data]
+        if missing:
+            raise ValueError(f"Missing variable in template: {', '.join(missing)}")
+
         return GenerationRequest(
             system_prompt=template.system_prompt,
             user_prompt=template.user_prompt_template,
@@ -78,6 +100,11 @@ class TemplateService:
             temperature=None
         )
 
+    def bulk_create_tasks(self, tasks: List[Dict[str, Any]]) -> None:
+        """Insert many generation tasks in a single bulk statement"""
+        self.db.bulk_insert_mappings(GenerationTask, tasks)
+        self.db.commit()
+
     def get_production_volume_template(self) -> Optional[Template]:
         """Get the Production Volume template"""
         return self.db.query(Template).filter(
@@ -139,45 +166,16 @@ Provide your analysis in the requested JSON format.""",
     def validate_template_output(self, template: Template, output: str) -> Dict[str, Any]:
         """Validate template output against quality check rules"""
         try:
-            if template.quality_check_rules:
-                rules = template.quality_check_rules
-
+            rules = template.quality_check_rules
+            if rules:
                 # Parse output as JSON
                 output_data = json.loads(output)
 
-                validation_result = {
-                    "is_valid": True,
-                    "issues": [],
-                    "suggestions": []
-                }
-
-                # Check required fields
-                if "required_fields" in rules:
-                    for field in rules["required_fields"]:
-                        if field not in output_data:
-                            validation_result["is_valid"] = False
-                            validation_result["issues"].append(f"Missing required field: {field}")
-
-                # Check valid classifications if applicable
-                if "valid_classifications" in rules and "classification" in output_data:
-                    if output_data["classification"] not in rules["valid_classifications"]:
-                        validation_result["is_valid"] = False
-                        validation_result["issues"].append(f"Invalid classification: {output_data['classification']}")
-
-                # Check confidence range if applicable
-                if "confidence_range" in rules and "confidence" in output_data:
-                    min_conf, max_conf = rules["confidence_range"]
-                    if not (min_conf <= output_data["confidence"] <= max_conf):
-                        validation_result["is_valid"] = False
-                        validation_result["issues"].append(f"Confidence out of range: {output_data['confidence']}")
-
-                # Check reasoning length if applicable
-                if "max_reasoning_length" in rules and "reasoning" in output_data:
-                    if len(output_data["reasoning"]) > rules["max_reasoning_length"]:
-                        validation_result["issues"].append(f"Reasoning too long: {len(output_data['reasoning'])} characters")
-                        validation_result["suggestions"].append("Shorten the reasoning text")
-
-                return validation_result
+                # Rules that aren't a dict carry no checks to apply
+                if not isinstance(rules, dict):
+                    return {"is_valid": True, "issues": [], "suggestions": []}
+
+                return self._get_validator(template)(output_data)
 
             return {"is_valid": True, "issues": [], "suggestions": []}
 
@@ -192,4 +190,74 @@ Provide your analysis in the requested JSON format.""",
                 "is_valid": False,
                 "issues": [f"Validation error: {str(e)}"],
                 "suggestions": ["Check template output format"]
-            }
\ No newline at end of file
+            }
+
+    def _get_validator(self, template: Template) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Get the compiled output validator for a template's quality check rules"""
+        rules = template.quality_check_rules
+        try:
+            return _compiled_schema(_rules_signature(rules))
+        except TypeError:
+            # Rules with nested unhashable values are compiled without caching
+            return _compile_quality_rules(rules)
+
+
+def _rules_signature(rules: Dict[str, Any]) -> tuple:
+    """Canonical, hashable signature of a quality check rules dict"""
+    return tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in rules.items()
+    ))
+
+
+@lru_cache(maxsize=128)
+def _compiled_schema(sig: tuple) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Compile quality check rules once per distinct rules signature, shared across services"""
+    return _compile_quality_rules(dict(sig))
+
+
+def _compile_quality_rules(rules: Dict[str, Any]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Compile template quality check rules into a reusable validator function"""
+    required_fields = tuple(rules.get("required_fields", ()))
+    # Tuple rather than frozenset: membership by equality, so unhashable outputs are simply invalid
+    valid_classifications = (
+        tuple(rules["valid_classifications"]) if "valid_classifications" in rules else None
+    )
+    confidence_range = tuple(rules["confidence_range"]) if "confidence_range" in rules else None
+    max_reasoning_length = rules.get("max_reasoning_length")
+
+    def validate(output_data: Dict[str, Any]) -> Dict[str, Any]:
+        validation_result = {
+            "is_valid": True,
+            "issues": [],
+            "suggestions": []
+        }
+
+        # Check required fields
+        for field in required_fields:
+            if field not in output_data:
+                validation_result["is_valid"] = False
+                validation_result["issues"].append(f"Missing required field: {field}")
+
+        # Check valid classifications if applicable
+        if valid_classifications is not None and "classification" in output_data:
+            if output_data["classification"] not in valid_classifications:
+                validation_result["is_valid"] = False
+                validation_result["issues"].append(f"Invalid classification: {output_data['classification']}")
+
+        # Check confidence range if applicable
+        if confidence_range is not None and "confidence" in output_data:
+            min_conf, max_conf = confidence_range
+            if not (min_conf <= output_data["confidence"] <= max_conf):
+                validation_result["is_valid"] = False
+                validation_result["issues"].append(f"Confidence out of range: {output_data['confidence']}")
+
+        # Check reasoning length if applicable
+        if max_reasoning_length is not None and "reasoning" in output_data:
+            if len(output_data["reasoning"]) > max_reasoning_length:
+                validation_result["issues"].append(f"Reasoning too long: {len(output_data['reasoning'])} characters")
+                validation_result["suggestions"].append("Shorten the reasoning text")
+
+        return validation_result
+
+    return validate
@@ -1,19 +1,40 @@
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union, BinaryIO
 import os
 
+ExcelSource = Union[str, os.PathLike, BinaryIO]
+
 
 class ExcelReader:
     """Utility class for reading Excel data"""
 
     @staticmethod
-    def read_excel_data(file_path: str) -> List[Dict[str, Any]]:
-        """Read Excel file and return data as list of dictionaries"""
-        if not os.path.exists(file_path):
+    def _check_exists(file_path: ExcelSource) -> None:
+        """Raise FileNotFoundError for a missing path; open file objects are read as-is"""
+        if isinstance(file_path, (str, os.PathLike)) and not os.path.exists(file_path):
             raise FileNotFoundError(f"Excel file not found: {file_path}")
 
+    @staticmethod
+    def _read_frame(file_path: ExcelSource) -> pd.DataFrame:
+        """Read Excel file into a DataFrame"""
+        ExcelReader._check_exists(file_path)
+        return pd.read_excel(file_path)
+
+    @staticmethod
+    def _filter_column(file_path: ExcelSource, column: str, value: str) -> List[Dict[str, Any]]:
+        """Rows whose column matches value case-insensitively, filtered on the DataFrame"""
+        df = ExcelReader._read_frame(file_path)
+        if column not in df.columns:
+            return []
+
+        mask = df[column].fillna('').astype(str).str.lower() == value.lower()
+        return df[mask].to_dict('records')
+
+    @staticmethod
+    def read_excel_data(file_path: ExcelSource) -> List[Dict[str, Any]]:
+        """Read Excel file (path or binary file object) and return data as list of dictionaries"""
         # Read Excel file
-        df = pd.read_excel(file_path)
+        df = ExcelReader._read_frame(file_path)
 
         # Convert to list of dictionaries
         data = df.to_dict('records')
@@ -21,90 +42,87 @@ class ExcelReader:
         return data
 
     @staticmethod
-    def get_excel_columns(file_path: str) -> List[str]:
+    def get_excel_columns(file_path: ExcelSource) -> List[str]:
         """Get column names from Excel file"""
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Excel file not found: {file_path}")
+        ExcelReader._check_exists(file_path)
 
-        df = pd.read_excel(file_path)
+        # Only the header row is needed
+        df = pd.read_excel(file_path, nrows=0)
         return df.columns.tolist()
 
     @staticmethod
-    def get_sample_data(file_path: str, sample_size: int = 5) -> List[Dict[str, Any]]:
+    def get_sample_data(file_path: ExcelSource, sample_size: int = 5) -> List[Dict[str, Any]]:
         """Get sample data from Excel file"""
         data = ExcelReader.read_excel_data(file_path)
         return data[:sample_size]
 
     @staticmethod
-    def get_wine_ids(file_path: str) -> List[str]:
+    def get_wine_ids(file_path: ExcelSource) -> List[str]:
         """Get all wine IDs from Excel file"""
         data = ExcelReader.read_excel_data(file_path)
         return [item.get('wine_id', '') for item in data if 'wine_id' in item]
 
     @staticmethod
-    def filter_by_wine_type(file_path: str, wine_type: str) -> List[Dict[str, Any]]:
+    def filter_by_wine_type(file_path: ExcelSource, wine_type: str) -> List[Dict[str, Any]]:
         """Filter data by wine type"""
-        data = ExcelReader.read_excel_data(file_path)
-        return [item for item in data if item.get('wine_type', '').lower() == wine_type.lower()]
+        return ExcelReader._filter_column(file_path, 'wine_type', wine_type)
 
     @staticmethod
-    def filter_by_region(file_path: str, region: str) -> List[Dict[str, Any]]:
+    def filter_by_region(file_path: ExcelSource, region: str) -> List[Dict[str, Any]]:
         """Filter data by region"""
-        data = ExcelReader.read_excel_data(file_path)
-        return [item for item in data if item.get('region', '').lower() == region.lower()]
+        return ExcelReader._filter_column(file_path, 'region', region)
+
+    @staticmethod
+    def _value_counts(df: pd.DataFrame, column: str) -> Dict[Any, int]:
+        """Count occurrences of each value in a column; rows without the column count as Unknown"""
+        if column not in df.columns:
+            return {"Unknown": len(df)}
+        return df[column].value_counts(dropna=False, sort=False).to_dict()
 
     @staticmethod
-    def get_statistics(file_path: str) -> Dict[str, Any]:
+    def get_statistics(file_path: ExcelSource) -> Dict[str, Any]:
         """Get basic statistics from Excel data"""
-        data = ExcelReader.read_excel_data(file_path)
+        df = ExcelReader._read_frame(file_path)
 
-        if not data:
+        if df.empty:
             return {}
 
         stats = {
-            "total_records": len(data),
-            "columns": ExcelReader.get_excel_columns(file_path),
-            "wine_types": {},
-            "regions": {},
+            "total_records": len(df),
+            "columns": df.columns.tolist(),
+            "wine_types": ExcelReader._value_counts(df, 'wine_type'),
+            "regions": ExcelReader._value_counts(df, 'region'),
             "vintage_range": {},
             "price_range": {}
         }
 
-        # Analyze wine types
-        for item in data:
-            wine_type = item.get('wine_type', 'Unknown')
-            stats["wine_types"][wine_type] = stats["wine_types"].get(wine_type, 0) + 1
-
-        # Analyze regions
-        for item in data:
-            region = item.get('region', 'Unknown')
-            stats["regions"][region] = stats["regions"].get(region, 0) + 1
-
         # Analyze vintage range
-        vintages = [item.get('vintage') for item in data if item.get('vintage') is not None]
-        if vintages:
+        vintages = df['vintage'].dropna() if 'vintage' in df.columns else None
+        if vintages is not None and not vintages.empty:
+            vintage_min, vintage_max = vintages.agg(['min', 'max']).tolist()
             stats["vintage_range"] = {
-                "min": min(vintages),
-                "max": max(vintages)
+                "min": vintage_min,
+                "max": vintage_max
             }
 
         # Analyze price range
-        prices = [item.get('price_ref') for item in data if item.get('price_ref') is not None]
-        if prices:
+        prices = df['price_ref'].dropna() if 'price_ref' in df.columns else None
+        if prices is not None and not prices.empty:
+            price_min, price_max, price_mean = prices.agg(['min', 'max', 'mean']).tolist()
             stats["price_range"] = {
-                "min": min(prices),
-                "max": max(prices),
-                "average": sum(prices) / len(prices)
+                "min": price_min,
+                "max": price_max,
+                "average": price_mean
             }
 
         return stats
 
     @staticmethod
-    def validate_required_columns(file_path: str, required_columns: List[str]) -> Dict[str, Any]:
+    def validate_required_columns(file_path: ExcelSource, required_columns: List[str]) -> Dict[str, Any]:
         """Validate that required columns exist in Excel file"""
         available_columns = ExcelReader.get_excel_columns(file_path)
 
-        missing_columns = [col for col in required_columns if col not in available_columns]
+        missing_columns = pd.Index(required_columns).difference(available_columns, sort=False).tolist()
 
         return {
             "is_valid": len(missing_columns) == 0,
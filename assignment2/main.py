@@ -3,8 +3,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.providers import router as providers_router
 from app.api.templates import router as templates_router
 from app.api.generation import router as generation_router
-from app.models.database import create_tables
+from app.models.database import create_tables, SessionLocal
+from app.services.template_service import TemplateService
 from app.utils.excel_reader import ExcelReader
+import asyncio
 import os
 from dotenv import load_dotenv
 
@@ -39,9 +41,6 @@ async def startup_event():
     create_tables()
 
     # Initialize production volume template if it doesn't exist
-    from app.services.template_service import TemplateService
-    from app.models.database import SessionLocal
-
     db = SessionLocal()
     try:
         template_service = TemplateService(db)
@@ -87,12 +86,11 @@ async def load_sample_data():
                 detail=f"Sample file {sku_file} not found"
             )
 
-        # Read and validate the data
-        from app.utils.excel_reader import ExcelReader
-
-        # Validate required columns
+        # Validate required columns; blocking reads run off the event loop
         required_columns = ["wine_id", "full_wine_name", "vintage", "winery", "region", "ranking"]
-        validation = ExcelReader.validate_required_columns(sku_file, required_columns)
+        validation = await asyncio.to_thread(
+            ExcelReader.validate_required_columns, sku_file, required_columns
+        )
 
         if not validation["is_valid"]:
             raise HTTPException(
@@ -100,8 +98,8 @@ async def load_sample_data():
                 detail=f"Missing required columns: {validation['missing_columns']}"
             )
 
-        # Get statistics
-        stats = ExcelReader.get_statistics(sku_file)
+        # Get statistics, only once validation has passed
+        stats = await asyncio.to_thread(ExcelReader.get_statistics, sku_file)
 
         return {
             "message": "Sample data loaded successfully",
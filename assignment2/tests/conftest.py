@@ -0,0 +1,123 @@
+"""
+Shared fixtures for the test suite
+"""
+import asyncio
+import pkgutil
+import sys
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.providers import ProviderConfig
+from app.models.database import Base
+
+try:
+    if sys.platform == "win32":
+        import winloop as uvloop
+    else:
+        import uvloop
+except ImportError:
+    uvloop = None
+
+
+BASE_CONFIG = ProviderConfig(name="Base", provider_type="openai", api_key="key")
+
+
+@pytest.fixture(scope="session")
+def app():
+    """FastAPI app, built on first use so runs that never touch the API skip importing main"""
+    from main import app as _app
+    return _app
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Single event loop shared by every async test and async fixture in the session"""
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """In-memory SQLite engine with the schema created once per session"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    # pysqlite defers BEGIN and breaks SAVEPOINT; let SQLAlchemy emit BEGIN itself
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(db_engine):
+    """Real ORM session; commits become savepoints and everything is rolled back after the test"""
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="session")
+def base_config():
+    """Validated provider config to derive variants from with model_copy(update=...)"""
+    return BASE_CONFIG
+
+
+@pytest.fixture(params=[
+    pytest.param(
+        (
+            'app.providers.openai_provider.OpenAIProvider',
+            'app.providers.openai_provider.openai.AsyncOpenAI',
+            ProviderConfig(
+                name="Test OpenAI Provider",
+                provider_type="openai",
+                api_key="test_api_key",
+                model="gpt-3.5-turbo",
+                max_tokens=1000,
+                temperature=0.7
+            )
+        ),
+        id="openai"
+    ),
+    pytest.param(
+        (
+            'app.providers.azure_provider.AzureOpenAIProvider',
+            'app.providers.azure_provider.openai.AsyncAzureOpenAI',
+            ProviderConfig(
+                name="Test Azure Provider",
+                provider_type="azure_openai",
+                api_key="test_api_key",
+                base_url="https://test-resource.openai.azure.com/",
+                model="deployment-name",
+                max_tokens=1000,
+                temperature=0.7
+            )
+        ),
+        id="azure_openai"
+    ),
+])
+def provider_env(request):
+    """Provider class, config and patched SDK client for each supported provider"""
+    # Resolved here so the openai SDK is only imported by tests that use a provider
+    provider_path, patch_target, config = request.param
+    provider_cls = pkgutil.resolve_name(provider_path)
+    with patch(patch_target) as mock_client:
+        yield provider_cls, config, mock_client
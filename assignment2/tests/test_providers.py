@@ -1,107 +1,114 @@
 import pytest
 import asyncio
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock, AsyncMock
 from app.providers.openai_provider import OpenAIProvider
 from app.providers.azure_provider import AzureOpenAIProvider
 from app.core.providers import ProviderConfig, GenerationRequest
 
 
-class TestOpenAIProvider:
-    """Test cases for OpenAI Provider"""
-
-    def setup_method(self):
-        """Setup test data"""
-        self.config = ProviderConfig(
-            name="Test OpenAI Provider",
-            provider_type="openai",
-            api_key="test_api_key",
-            model="gpt-3.5-turbo",
-            max_tokens=1000,
-            temperature=0.7
-        )
+class TestProviderCommon:
+    """Test cases shared by every provider implementation"""
 
     @pytest.mark.asyncio
-    async def test_generate_content_success(self):
+    async def test_generate_content_success(self, provider_env):
         """Test successful content generation"""
-        # Mock OpenAI client
-        with patch('app.providers.openai_provider.openai.AsyncOpenAI') as mock_client:
-            # Mock response
-            mock_response = Mock()
-            mock_response.choices = [Mock()]
-            mock_response.choices[0].message = Mock()
-            mock_response.choices[0].message.content = "Test response"
-            mock_response.usage = Mock()
-            mock_response.usage.total_tokens = 100
-
-            mock_client.return_value = Mock()
-            mock_client.return_value.chat.completions.create = AsyncMock(return_value=mock_response)
-
-            provider = OpenAIProvider(self.config)
-            request = GenerationRequest(
-                system_prompt="Test system prompt",
-                user_prompt="Test user prompt",
-                variables={"name": "test"}
-            )
-
-            result = await provider.generate_content(request)
-
-            assert result.content == "Test response"
-            assert result.model_used == "gpt-3.5-turbo"
-            assert result.tokens_used == 100
-            assert result.error is None
+        provider_cls, config, mock_client = provider_env
+
+        # Mock response
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message = Mock()
+        mock_response.choices[0].message.content = "Test response"
+        mock_response.usage = Mock()
+        mock_response.usage.total_tokens = 100
+
+        mock_client.return_value = Mock()
+        mock_client.return_value.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        provider = provider_cls(config)
+        request = GenerationRequest(
+            system_prompt="Test system prompt",
+            user_prompt="Test user prompt",
+            variables={"name": "test"}
+        )
+
+        result = await provider.generate_content(request)
+
+        assert result.content == "Test response"
+        assert result.model_used == config.model
+        assert result.tokens_used == 100
+        assert result.error is None
 
     @pytest.mark.asyncio
-    async def test_generate_content_error(self):
+    async def test_generate_content_error(self, provider_env):
         """Test content generation with error"""
-        with patch('app.providers.openai_provider.openai.AsyncOpenAI') as mock_client:
-            mock_client.return_value.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
+        provider_cls, config, mock_client = provider_env
+        mock_client.return_value.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
 
-            provider = OpenAIProvider(self.config)
-            request = GenerationRequest(
-                system_prompt="Test system prompt",
-                user_prompt="Test user prompt"
-            )
+        provider = provider_cls(config)
+        request = GenerationRequest(
+            system_prompt="Test system prompt",
+            user_prompt="Test user prompt"
+        )
 
-            result = await provider.generate_content(request)
+        result = await provider.generate_content(request)
 
-            assert result.content == ""
-            assert result.error == "API Error"
+        assert result.content == ""
+        assert result.error == "API Error"
 
     @pytest.mark.asyncio
-    async def test_test_connection_success(self):
+    async def test_test_connection_success(self, provider_env):
         """Test successful connection"""
-        with patch('app.providers.openai_provider.openai.AsyncOpenAI') as mock_client:
-            mock_response = Mock()
-            mock_response.choices = [Mock()]
-            mock_response.choices[0].message = Mock()
-            mock_response.choices[0].message.content = "test"
+        provider_cls, config, mock_client = provider_env
 
-            mock_client.return_value = Mock()
-            mock_client.return_value.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message = Mock()
+        mock_response.choices[0].message.content = "test"
 
-            provider = OpenAIProvider(self.config)
-            result = await provider.test_connection()
+        mock_client.return_value = Mock()
+        mock_client.return_value.chat.completions.create = AsyncMock(return_value=mock_response)
 
-            assert result is True
+        provider = provider_cls(config)
+        result = await provider.test_connection()
+
+        assert result is True
 
     @pytest.mark.asyncio
-    async def test_test_connection_failure(self):
+    async def test_test_connection_failure(self, provider_env):
         """Test connection failure"""
-        with patch('app.providers.openai_provider.openai.AsyncOpenAI') as mock_client:
-            mock_client.return_value.chat.completions.create = AsyncMock(side_effect=Exception("Connection Error"))
+        provider_cls, config, mock_client = provider_env
+        mock_client.return_value.chat.completions.create = AsyncMock(side_effect=Exception("Connection Error"))
 
-            provider = OpenAIProvider(self.config)
-            result = await provider.test_connection()
+        provider = provider_cls(config)
+        result = await provider.test_connection()
 
-            assert result is False
+        assert result is False
 
-    def test_validate_config_success(self):
+    def test_validate_config_success(self, provider_env):
         """Test successful configuration validation"""
-        provider = OpenAIProvider(self.config)
+        provider_cls, config, _ = provider_env
+
+        provider = provider_cls(config)
         errors = provider.validate_config()
 
         assert len(errors) == 0
 
+
+class TestOpenAIProvider:
+    """Test cases for OpenAI Provider"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.config = ProviderConfig(
+            name="Test OpenAI Provider",
+            provider_type="openai",
+            api_key="test_api_key",
+            model="gpt-3.5-turbo",
+            max_tokens=1000,
+            temperature=0.7
+        )
+
     def test_validate_config_missing_api_key(self):
         """Test configuration validation with missing API key"""
         config = ProviderConfig(
@@ -143,33 +150,6 @@ class TestAzureOpenAIProvider:
             temperature=0.7
         )
 
-    @pytest.mark.asyncio
-    async def test_generate_content_success(self):
-        """Test successful content generation"""
-        with patch('app.providers.azure_provider.openai.AsyncAzureOpenAI') as mock_client:
-            # Mock response
-            mock_response = Mock()
-            mock_response.choices = [Mock()]
-            mock_response.choices[0].message = Mock()
-            mock_response.choices[0].message.content = "Azure test response"
-            mock_response.usage = Mock()
-            mock_response.usage.total_tokens = 150
-
-            mock_client.return_value = Mock()
-            mock_client.return_value.chat.completions.create = AsyncMock(return_value=mock_response)
-
-            provider = AzureOpenAIProvider(self.config)
-            request = GenerationRequest(
-                system_prompt="Test system prompt",
-                user_prompt="Test user prompt"
-            )
-
-            result = await provider.generate_content(request)
-
-            assert result.content == "Azure test response"
-            assert result.model_used == "deployment-name"
-            assert result.tokens_used == 150
-
     def test_is_valid_azure_endpoint(self):
         """Test Azure endpoint validation"""
         provider = AzureOpenAIProvider(self.config)
@@ -3,59 +3,73 @@ Unit tests for services layer
 """
 import pytest
 import json
-from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime
-import asyncio
 
 # Import services and models
-from app.services.template_service import TemplateService
+from app.services.template_service import TemplateService, _placeholder_names
 from app.services.quality_service import QualityService
-from app.core.providers import ProviderConfig, GenerationRequest, GenerationResponse
-from app.models.database import Template, AIProvider, GenerationTask as DBGenerationRequest
+from app.core.providers import GenerationRequest
+from app.models.database import Template, GenerationTask as DBGenerationRequest
+
+# Output schemas are encoded once at import rather than in every fixture call
+_OUTPUT_SCHEMA_JSON = json.dumps({"message": "string", "status": "string"})
+_FIELD1_SCHEMA_JSON = json.dumps({"field1": "string"})
+
+# Fixed timestamp for template rows; tests never depend on the wall clock
+_NOW = datetime(2024, 1, 1)
+
+
+# (content, rules, is_valid, (min_score, max_score), expected issue codes)
+QUALITY_CASES = [
+    pytest.param(
+        "This is an excellent piece of content about wine production. It covers the winery, the region and the volume of bottles produced.",
+        {},
+        True, (90, 100), frozenset(),
+        id="perfect"
+    ),
+    pytest.param("Short", {}, True, (70, 70), frozenset({"CONTENT_TOO_SHORT"}), id="too-short"),
+    pytest.param("Any content", {}, True, (90, 90), frozenset(), id="no-rules"),
+    pytest.param("", {}, False, (0, 49), frozenset({"CONTENT_EMPTY"}), id="empty-content"),
+    pytest.param("   \n\t  \n   ", {}, False, (0, 49), frozenset({"CONTENT_EMPTY"}), id="whitespace-only"),
+    pytest.param("not json at all, just wine", {"require_json_format": True}, True, (75, 75),
+                 frozenset({"INVALID_JSON"}), id="invalid-json"),
+    pytest.param('{"classification": "Rare"}', {"require_json_format": True}, True, (100, 100),
+                 frozenset(), id="valid-json"),
+]
 
 
 class TestTemplateService:
     """Test TemplateService functionality"""
 
     @pytest.fixture
-    def mock_db(self):
-        """Mock database session"""
-        db = Mock()
-        db.add = Mock()
-        db.commit = Mock()
-        db.refresh = Mock()
-        db.delete = Mock()
-        db.query = Mock()
-        db.close = Mock()
-        return db
+    def template_service(self, db_session):
+        """Create TemplateService instance on an in-memory database session"""
+        return TemplateService(db_session)
 
     @pytest.fixture
-    def template_service(self, mock_db):
-        """Create TemplateService instance with mocked database"""
-        return TemplateService(mock_db)
-
-    @pytest.fixture
-    def mock_template(self):
-        """Mock template object"""
-        template = Mock(spec=Template)
-        template.id = 1
-        template.name = "Test Template"
-        template.system_prompt = "Test system prompt"
-        template.user_prompt = "Hello {name}, welcome to {company}!"
-        template.output_schema = json.dumps({"message": "string", "status": "string"})
-        template.is_active = True
-        template.created_at = datetime.now()
-        template.updated_at = datetime.now()
+    def stored_template(self, db_session):
+        """Template row persisted in the test session"""
+        template = Template(
+            name="Test Template",
+            system_prompt="Test system prompt",
+            user_prompt_template="Hello {name}, welcome to {company}!",
+            output_format_requirements=_OUTPUT_SCHEMA_JSON,
+            is_active=True,
+            created_at=_NOW,
+            updated_at=_NOW
+        )
+        db_session.add(template)
+        db_session.flush()
         return template
 
-    def test_create_template_success(self, template_service, mock_db, mock_template):
+    def test_create_template_success(self, template_service, db_session):
         """Test successful template creation"""
         # Setup
         template_data = {
             "name": "Test Template",
             "system_prompt": "Test system prompt",
-            "user_prompt": "Hello {name}",
-            "output_schema": json.dumps({"field1": "string"})
+            "user_prompt_template": "Hello {name}",
+            "output_format_requirements": _FIELD1_SCHEMA_JSON
         }
 
         # Execute
@@ -64,206 +78,215 @@ class TestTemplateService:
         # Verify
         assert isinstance(result, Template)
         assert result.name == "Test Template"
-        assert result.system_prompt == "Test system_prompt"
-        assert result.user_prompt == "Hello {name}"
-        mock_db.add.assert_called_once()
-        mock_db.commit.assert_called_once()
-        mock_db.refresh.assert_called_once()
+        assert result.system_prompt == "Test system prompt"
+        assert result.user_prompt_template == "Hello {name}"
+        assert result.output_format_requirements == _FIELD1_SCHEMA_JSON
+        assert db_session.query(Template).count() == 1
 
-    def test_get_template_found(self, template_service, mock_db, mock_template):
+    def test_get_template_found(self, template_service, stored_template):
         """Test getting template when found"""
-        # Setup
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_template
-
         # Execute
-        result = template_service.get_template(1)
+        result = template_service.get_template(stored_template.id)
 
         # Verify
-        assert result == mock_template
-        mock_db.query.assert_called_once_with(Template)
+        assert result is stored_template
 
-    def test_get_template_not_found(self, template_service, mock_db):
+    def test_get_template_not_found(self, template_service):
         """Test getting template when not found"""
-        # Setup
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-
         # Execute
         result = template_service.get_template(999)
 
         # Verify
         assert result is None
-        mock_db.query.assert_called_once_with(Template)
 
-    def test_get_all_templates(self, template_service, mock_db):
+    def test_get_all_templates(self, template_service, db_session):
         """Test getting all templates"""
         # Setup
-        mock_templates = [Mock(), Mock(), Mock()]
-        mock_db.query.return_value.all.return_value = mock_templates
+        templates = [
+            Template(name=f"Template {i}", system_prompt="System", user_prompt_template="User")
+            for i in range(3)
+        ]
+        db_session.add_all(templates)
+        db_session.flush()
 
         # Execute
         result = template_service.get_all_templates()
 
         # Verify
-        assert result == mock_templates
-        mock_db.query.assert_called_once_with(Template)
+        assert result == templates
 
-    def test_update_template_success(self, template_service, mock_db, mock_template):
+    def test_update_template_success(self, template_service, stored_template):
         """Test successful template update"""
         # Setup
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_template
-
         update_data = {
             "name": "Updated Template",
             "system_prompt": "Updated system prompt"
         }
 
         # Execute
-        result = template_service.update_template(1, update_data)
+        result = template_service.update_template(stored_template.id, update_data)
 
         # Verify
-        assert result == mock_template
-        assert mock_template.name == "Updated Template"
-        assert mock_template.system_prompt == "Updated system prompt"
-        mock_db.commit.assert_called_once()
+        assert result is stored_template
+        assert stored_template.name == "Updated Template"
+        assert stored_template.system_prompt == "Updated system prompt"
 
-    def test_update_template_not_found(self, template_service, mock_db):
+    def test_update_template_not_found(self, template_service):
         """Test updating template when not found"""
         # Setup
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-
         update_data = {"name": "Updated Template"}
 
-        # Execute and verify
-        with pytest.raises(ValueError, match="Template not found"):
-            template_service.update_template(999, update_data)
+        # Execute
+        result = template_service.update_template(999, update_data)
 
-    def test_delete_template_success(self, template_service, mock_db, mock_template):
-        """Test successful template deletion"""
-        # Setup
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_template
+        # Verify
+        assert result is None
 
+    def test_delete_template_success(self, template_service, db_session, stored_template):
+        """Test successful template deletion"""
         # Execute
-        result = template_service.delete_template(1)
+        result = template_service.delete_template(stored_template.id)
 
         # Verify
         assert result is True
-        mock_db.delete.assert_called_once_with(mock_template)
-        mock_db.commit.assert_called_once()
+        assert db_session.query(Template).count() == 0
 
-    def test_delete_template_not_found(self, template_service, mock_db):
+    def test_delete_template_not_found(self, template_service, db_session, stored_template):
         """Test deleting template when not found"""
-        # Setup
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-
         # Execute
         result = template_service.delete_template(999)
 
         # Verify
         assert result is False
-        mock_db.delete.assert_not_called()
-        mock_db.commit.assert_not_called()
+        assert db_session.query(Template).count() == 1
 
-    def test_create_generation_request_success(self, template_service, mock_db, mock_template):
-        """Test generation request creation"""
+    def test_bulk_create_tasks(self, template_service, db_session):
+        """Test bulk insertion of generation tasks"""
         # Setup
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_template
+        tasks = [
+            {"task_id": f"task-{i}", "template_id": 1, "provider_id": 1, "input_data": {"wine_id": i}}
+            for i in range(5)
+        ]
 
+        # Execute
+        template_service.bulk_create_tasks(tasks)
+
+        # Verify
+        stored = db_session.query(DBGenerationRequest).order_by(DBGenerationRequest.id).all()
+        assert [task.task_id for task in stored] == [f"task-{i}" for i in range(5)]
+        assert stored[3].input_data == {"wine_id": 3}
+
+    def test_create_generation_request_success(self, template_service, stored_template):
+        """Test generation request creation"""
+        # Setup
         input_data = {"name": "John", "company": "Acme"}
 
         # Execute
-        result = template_service.create_generation_request(1, input_data)
+        result = template_service.create_generation_request(stored_template.id, input_data)
 
         # Verify
         assert isinstance(result, GenerationRequest)
         assert result.system_prompt == "Test system prompt"
-        assert result.user_prompt == "Hello John, welcome to Acme!"
+        # Variables are substituted by the provider, not here
+        assert result.user_prompt == stored_template.user_prompt_template
         assert result.variables == input_data
 
-    def test_create_generation_request_template_not_found(self, template_service, mock_db):
+    def test_user_prompt_placeholders(self, stored_template):
+        """Test placeholder extraction from the template user prompt"""
+        assert _placeholder_names(stored_template.user_prompt_template) == ["name", "company"]
+
+    @pytest.mark.parametrize("prompt, expected", [
+        ("{{literal}} for {name}", ["name"]),
+        ("{price:.2f} and {label!r}", ["price", "label"]),
+        ("{item.name} / {items[0]}", ["item", "items"]),
+        ("no placeholders", []),
+    ])
+    def test_placeholder_names_follow_str_format(self, prompt, expected):
+        """Test placeholder extraction matches what str.format would look up"""
+        assert _placeholder_names(prompt) == expected
+
+    def test_create_generation_request_template_not_found(self, template_service):
         """Test generation request with non-existent template"""
         # Setup
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-
         input_data = {"name": "John"}
 
         # Execute and verify
-        with pytest.raises(ValueError, match="Template not found"):
+        with pytest.raises(ValueError, match="Template with ID 999 not found"):
             template_service.create_generation_request(999, input_data)
 
-    def test_create_generation_request_missing_variables(self, template_service, mock_db, mock_template):
+    def test_create_generation_request_missing_variables(self, template_service, stored_template):
         """Test generation request with missing variables"""
         # Setup
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_template
-
         input_data = {"name": "John"}  # Missing 'company' variable
 
         # Execute and verify
         with pytest.raises(ValueError, match="Missing variable"):
-            template_service.create_generation_request(1, input_data)
+            template_service.create_generation_request(stored_template.id, input_data)
 
     def test_validate_template_output_valid(self, template_service):
         """Test validation of valid template output"""
         # Setup
-        output_schema = {"message": "string", "status": "string"}
-        output_data = {"message": "Hello World", "status": "success"}
+        template = Template(quality_check_rules={"required_fields": ["message", "status"]})
+        output = json.dumps({"message": "Hello World", "status": "success"})
 
         # Execute
-        result = template_service.validate_template_output(output_schema, output_data)
+        result = template_service.validate_template_output(template, output)
 
         # Verify
-        assert result is True
+        assert result == {"is_valid": True, "issues": [], "suggestions": []}
 
     def test_validate_template_output_missing_fields(self, template_service):
         """Test validation of output with missing required fields"""
         # Setup
-        output_schema = {"message": "string", "status": "string", "count": "integer"}
-        output_data = {"message": "Hello World", "status": "success"}  # Missing count
+        template = Template(quality_check_rules={"required_fields": ["message", "status", "count"]})
+        output = json.dumps({"message": "Hello World", "status": "success"})  # Missing count
 
         # Execute
-        result = template_service.validate_template_output(output_schema, output_data)
+        result = template_service.validate_template_output(template, output)
 
         # Verify
-        assert result is False
+        assert result["is_valid"] is False
+        assert result["issues"] == ["Missing required field: count"]
 
     def test_validate_template_output_invalid_json(self, template_service):
         """Test validation with invalid JSON output"""
         # Setup
-        output_schema = {"message": "string"}
-        invalid_json = "This is not valid JSON"
+        template = Template(quality_check_rules={"required_fields": ["message"]})
 
-        # Execute and verify
-        with pytest.raises(ValueError, match="Invalid JSON"):
-            template_service.validate_template_output(output_schema, invalid_json)
+        # Execute
+        result = template_service.validate_template_output(template, "This is not valid JSON")
 
-    def test_get_production_volume_template_found(self, template_service, mock_db, mock_template):
+        # Verify
+        assert result["is_valid"] is False
+        assert result["issues"] == ["Invalid JSON format in output"]
+
+    def test_get_production_volume_template_found(self, template_service, db_session):
         """Test getting production volume template when it exists"""
         # Setup
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_template
+        pv_template = Template(
+            name="Production Volume Generation",
+            system_prompt="System",
+            user_prompt_template="User"
+        )
+        db_session.add(pv_template)
+        db_session.flush()
 
         # Execute
         result = template_service.get_production_volume_template()
 
         # Verify
-        assert result == mock_template
-        mock_db.query.assert_called_once_with(Template)
+        assert result is pv_template
 
-    def test_get_production_volume_template_not_found(self, template_service, mock_db):
+    def test_get_production_volume_template_not_found(self, template_service, stored_template):
         """Test getting production volume template when it doesn't exist"""
-        # Setup
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-
         # Execute
         result = template_service.get_production_volume_template()
 
         # Verify
         assert result is None
 
-    @patch('app.services.template_service.datetime')
-    def test_create_production_volume_template_success(self, mock_datetime, template_service, mock_db):
+    def test_create_production_volume_template_success(self, template_service, db_session):
         """Test creating production volume template"""
-        # Setup
-        mock_datetime.now.return_value.isoformat.return_value = "2023-01-01T00:00:00"
-
         # Execute
         result = template_service.create_production_volume_template()
 
@@ -272,144 +295,138 @@ class TestTemplateService:
         assert result.name == "Production Volume Generation"
         assert "wine industry analyst" in result.system_prompt.lower()
         assert "production volume" in result.system_prompt.lower()
-        mock_db.add.assert_called_once()
-        mock_db.commit.assert_called_once()
-        mock_db.refresh.assert_called_once()
+        assert db_session.query(Template).count() == 1
 
-    def test_create_production_volume_template_already_exists(self, template_service, mock_db):
+    def test_create_production_volume_template_already_exists(self, template_service, db_session):
         """Test creating production volume template when it already exists"""
         # Setup
-        mock_db.query.return_value.filter.return_value.first.return_value = Mock()
+        existing = template_service.create_production_volume_template()
 
-        # Execute and verify
-        with pytest.raises(Exception, match="Production Volume template already exists"):
-            template_service.create_production_volume_template()
+        # Execute - callers check get_production_volume_template first; creation itself doesn't dedupe
+        result = template_service.create_production_volume_template()
+
+        # Verify
+        assert result is not existing
+        assert db_session.query(Template).count() == 2
+        assert template_service.get_production_volume_template() is existing
 
 
 class TestQualityService:
     """Test QualityService functionality"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def quality_service(self):
         """Create QualityService instance"""
         return QualityService()
 
-    def test_check_content_quality_perfect(self, quality_service):
-        """Test quality check for perfect content"""
+    def test_check_content_quality_issue_codes(self, quality_service):
+        """Test quality check reports a stable code per issue"""
         # Setup
-        content = "This is an excellent piece of content that is well-written, informative, and meets all quality standards. It provides comprehensive information and follows best practices."
-        rules = ["min_length", "contains_keywords", "no_empty_lines"]
+        rules = {"require_json_format": True, "required_fields": ["classification"]}
 
         # Execute
-        result = quality_service.check_content_quality(content, rules)
+        result = quality_service.check_content_quality("not json", rules)
 
         # Verify
-        assert result.is_valid is True
-        assert result.score >= 80
-        assert len(result.issues) == 0
-        assert len(result.suggestions) >= 0
-
-    def test_check_content_quality_too_short(self, quality_service):
-        """Test quality check for content that's too short"""
-        # Setup
-        content = "Short"
-        rules = ["min_length"]
+        assert result.issue_codes == {"CONTENT_TOO_SHORT", "INVALID_JSON"}
+        assert len(result.issues) == 2
 
+    def test_check_content_quality_too_long(self, quality_service):
+        """Test content over the length limit reports CONTENT_TOO_LONG"""
         # Execute
-        result = quality_service.check_content_quality(content, rules)
+        result = quality_service.check_content_quality("x" * 10001, {})
 
         # Verify
-        assert result.is_valid is False
-        assert result.score < 50
-        assert any("too short" in issue.lower() for issue in result.issues)
+        assert result.issue_codes == {"CONTENT_TOO_LONG"}
+        assert result.score == 80
 
-    def test_check_content_quality_missing_keywords(self, quality_service):
-        """Test quality check for content missing required keywords"""
+    def test_check_content_quality_json_rule_codes(self, quality_service):
+        """Test each JSON output rule reports its own code"""
         # Setup
-        content = "This is some random text without important terms."
-        rules = ["contains_keywords"]
-
-        # Execute
-        result = quality_service.check_content_quality(content, rules)
-
-        # Verify
-        assert result.is_valid is False
-        assert result.score < 70
-        assert any("keywords" in issue.lower() for issue in result.issues)
-
-    def test_check_content_quality_empty_lines(self, quality_service):
-        """Test quality check for content with excessive empty lines"""
-        # Setup
-        content = "Line 1\n\n\n\n\nLine 2"  # Multiple empty lines
-        rules = ["no_empty_lines"]
+        content = json.dumps({
+            "production_volume": 5000,
+            "classification": "Epic",
+            "reasoning": "r" * 600,
+            "confidence": 2.0
+        })
+        rules = {
+            "require_json_format": True,
+            "required_fields": ["production_volume", "winery"],
+            "valid_classifications": ["Rare"],
+            "confidence_range": [0.1, 1.0],
+            "max_reasoning_length": 500
+        }
 
         # Execute
         result = quality_service.check_content_quality(content, rules)
 
         # Verify
+        assert result.issue_codes == {
+            "MISSING_REQUIRED_FIELD",
+            "INVALID_CLASSIFICATION",
+            "CONFIDENCE_OUT_OF_RANGE",
+            "REASONING_TOO_LONG"
+        }
         assert result.is_valid is False
-        assert result.score < 80
-        assert any("empty lines" in issue.lower() for issue in result.issues)
-
-    def test_check_content_quality_no_rules(self, quality_service):
-        """Test quality check with no rules specified"""
-        # Setup
-        content = "Any content"
-        rules = []
+        assert result.suggestions == ["Shorten reasoning to 500 characters or less"]
 
+    @pytest.mark.parametrize("content,rules,is_valid,score_range,issue_codes", QUALITY_CASES)
+    def test_check_content_quality(self, quality_service, content, rules, is_valid, score_range, issue_codes):
+        """Test quality check verdict, score bounds and reported issues"""
         # Execute
         result = quality_service.check_content_quality(content, rules)
 
         # Verify
-        assert result.is_valid is True
-        assert result.score == 100
-        assert len(result.issues) == 0
+        assert result.is_valid is is_valid
+        min_score, max_score = score_range
+        assert min_score <= result.score <= max_score
+        assert result.issue_codes == issue_codes
+        assert len(result.issues) == len(issue_codes)
 
-    def test_check_content_quality_empty_content(self, quality_service):
-        """Test quality check for empty content"""
+    def test_check_content_quality_missing_keywords(self, quality_service):
+        """Test content without any domain keywords loses relevance points"""
         # Setup
-        content = ""
-        rules = ["min_length"]
+        without_keywords = "This is some random text without important terms."
+        with_keywords = "This is some random text about a winery in a region."
 
         # Execute
-        result = quality_service.check_content_quality(content, rules)
+        result = quality_service.check_content_quality(without_keywords, {})
+        baseline = quality_service.check_content_quality(with_keywords, {})
 
-        # Verify
-        assert result.is_valid is False
-        assert result.score == 0
-        assert any("empty" in issue.lower() for issue in result.issues)
+        # Verify - a relevance penalty only, not a reported issue
+        assert result.score < baseline.score
+        assert result.issues == []
 
-    def test_check_content_quality_whitespace_only(self, quality_service):
-        """Test quality check for content with only whitespace"""
+    def test_check_content_quality_empty_lines(self, quality_service):
+        """Test runs of empty lines are penalised as excessive spacing"""
         # Setup
-        content = "   \n\t  \n   "
-        rules = ["min_length"]
+        content = "Line 1\n\n\n\n\nLine 2"  # Multiple empty lines
 
         # Execute
-        result = quality_service.check_content_quality(content, rules)
+        result = quality_service.check_content_quality(content, {})
+        baseline = quality_service.check_content_quality("Line 1\nLine 2", {})
 
         # Verify
-        assert result.is_valid is False
-        assert result.score == 0
+        assert result.score == baseline.score - 5
+        assert result.issues == []
 
     def test_check_content_quality_custom_rules(self, quality_service):
-        """Test quality check with custom validation rules"""
+        """Test unknown rule keys are ignored"""
         # Setup
         content = "This content needs to have specific format and requirements."
-        rules = ["custom_format_check"]
 
         # Execute
-        result = quality_service.check_content_quality(content, rules)
+        result = quality_service.check_content_quality(content, {"custom_format_check": True})
+        baseline = quality_service.check_content_quality(content, {})
 
-        # Verify - custom rule should check for format requirements
-        assert isinstance(result.is_valid, bool)
-        assert 0 <= result.score <= 100
+        # Verify
+        assert result == baseline
 
     def test_check_content_quality_multiple_issues(self, quality_service):
         """Test quality check that identifies multiple issues"""
         # Setup
-        content = "Short.\n\n\nMissing keywords"
-        rules = ["min_length", "contains_keywords", "no_empty_lines"]
+        content = "brief"
+        rules = {"require_json_format": True}
 
         # Execute
         result = quality_service.check_content_quality(content, rules)
@@ -417,34 +434,30 @@ class TestQualityService:
         # Verify
         assert result.is_valid is False
         assert result.score < 50
-        assert len(result.issues) >= 2  # Should find multiple issues
+        assert result.issue_codes == {"CONTENT_TOO_SHORT", "INVALID_JSON"}
         assert len(result.suggestions) >= 1  # Should provide suggestions
 
     def test_quality_scoring_consistency(self, quality_service):
         """Test that quality scoring is consistent"""
         # Setup
         content = "This is a moderately good piece of content that has some issues but overall provides value to the reader."
-        rules = ["min_length", "contains_keywords"]
+        rules = {"require_json_format": True}
 
-        # Execute multiple times and verify consistency
-        results = []
-        for _ in range(5):
-            result = quality_service.check_content_quality(content, rules)
-            results.append(result.score)
+        # Execute twice; the checker has no random state, so two runs suffice
+        scores = {quality_service.check_content_quality(content, rules).score for _ in range(2)}
 
-        # Verify all scores are the same (consistent scoring)
-        assert all(score == results[0] for score in results)
+        # Verify both scores are the same (consistent scoring)
+        assert len(scores) == 1
 
     def test_check_content_quality_with_suggestions(self, quality_service):
         """Test that quality check provides helpful suggestions"""
         # Setup
         content = "brief"
-        rules = ["min_length", "contains_keywords"]
+        rules = {"require_json_format": True}
 
         # Execute
         result = quality_service.check_content_quality(content, rules)
 
         # Verify
-        if not result.is_valid:
-            assert len(result.suggestions) > 0
-            assert all(isinstance(suggestion, str) for suggestion in result.suggestions)
\ No newline at end of file
+        assert result.is_valid is False
+        assert result.suggestions == ["Ensure content is properly formatted JSON"]
@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from app.services.template_service import TemplateService
+from app.services.template_service import TemplateService, _compiled_schema
 from app.models.database import Template
 from app.core.providers import GenerationRequest
 
@@ -121,6 +121,13 @@ class TestTemplateService:
         assert result.system_prompt == "Test system prompt"
         assert result.user_prompt == "Hello John"
 
+    def test_create_generation_request_missing_variable(self):
+        """Test generation request creation with an unfilled placeholder"""
+        self.db.query.return_value.filter.return_value.first.return_value = self.mock_template
+
+        with pytest.raises(ValueError, match="Missing variable in template: name"):
+            self.template_service.create_generation_request(1, {})
+
     def test_create_generation_template_not_found(self):
         """Test generation request creation with non-existent template"""
         self.db.query.return_value.filter.return_value.first.return_value = None
@@ -164,6 +171,59 @@ class TestTemplateService:
         assert result["is_valid"] is False
         assert "Invalid JSON format in output" in result["issues"]
 
+    def test_validate_template_output_cached(self):
+        """Test template output validation compiles each rules shape once"""
+        self.mock_template.quality_check_rules = {
+            "required_fields": ["classification", "confidence"],
+            "valid_classifications": ["Rare", "Common"],
+            "confidence_range": [0.1, 1.0]
+        }
+        _compiled_schema.cache_clear()
+
+        first = self.template_service.validate_template_output(
+            self.mock_template, '{"classification": "Rare", "confidence": 0.5}'
+        )
+        second = self.template_service.validate_template_output(
+            self.mock_template, '{"classification": "Epic", "confidence": 2.0}'
+        )
+
+        assert first["is_valid"] is True
+        assert second["is_valid"] is False
+        assert "Invalid classification: Epic" in second["issues"]
+        assert "Confidence out of range: 2.0" in second["issues"]
+        assert _compiled_schema.cache_info().hits >= 1
+
+    def test_validate_template_output_follows_rule_changes(self):
+        """Test validators are keyed by rules, not template id, so edits and unsaved templates never share a stale one"""
+        unsaved = Mock(id=None, quality_check_rules={"required_fields": ["field1"]})
+        other_unsaved = Mock(id=None, quality_check_rules={"required_fields": ["field2"]})
+        output = '{"field1": "value1"}'
+
+        assert self.template_service.validate_template_output(unsaved, output)["is_valid"] is True
+        assert self.template_service.validate_template_output(other_unsaved, output)["is_valid"] is False
+
+        # Same template after its rules are edited in place (as update_template does)
+        unsaved.quality_check_rules = {"required_fields": ["field1", "field3"]}
+        result = self.template_service.validate_template_output(unsaved, output)
+        assert "Missing required field: field3" in result["issues"]
+
+    def test_validate_template_output_unhashable_classification(self):
+        """Test an unhashable classification is reported as invalid, not as a validation error"""
+        self.mock_template.quality_check_rules = {"valid_classifications": ["ClassA", "ClassB"]}
+
+        result = self.template_service.validate_template_output(self.mock_template, '{"classification": ["ClassA"]}')
+
+        assert result["is_valid"] is False
+        assert result["issues"] == ["Invalid classification: ['ClassA']"]
+
+    def test_validate_template_output_non_dict_rules(self):
+        """Test rules that aren't a dict apply no checks, but the output must still be JSON"""
+        self.mock_template.quality_check_rules = ["required_fields"]
+
+        assert self.template_service.validate_template_output(self.mock_template, '{"a": 1}')["is_valid"] is True
+        result = self.template_service.validate_template_output(self.mock_template, "not json")
+        assert result["issues"] == ["Invalid JSON format in output"]
+
     def test_get_production_volume_template_found(self):
         """Test getting existing production volume template"""
         mock_pv_template = Mock()
@@ -2,111 +2,105 @@
 Unit tests for utility modules (simplified)
 """
 import pytest
-import os
-import tempfile
-from unittest.mock import Mock, patch, mock_open
-import pandas as pd
+import io
+from unittest.mock import patch
 
-# Import utility functions
-from app.utils.excel_reader import ExcelReader
+
+SAMPLE_EXCEL_DATA = {
+    'wine_name': ['Chateau Margaux', 'Opus One', 'Sassicaia'],
+    'wine_id': ['CM001', 'OP001', 'SA001'],
+    'wine_type': ['Red', 'Red', 'Red'],
+    'region': ['Bordeaux', 'Napa Valley', 'Tuscany'],
+    'price_ref': [1000.0, 350.0, 250.0],
+    'vintage': [2015, 2018, 2016]
+}
+
+
+@pytest.fixture(scope="session")
+def pd():
+    """pandas, imported only when a test here actually runs (not at collection)"""
+    import pandas
+    return pandas
+
+
+@pytest.fixture(scope="module")
+def excel_reader():
+    """Create ExcelReader instance"""
+    from app.utils.excel_reader import ExcelReader
+    return ExcelReader()
+
+
+@pytest.fixture(scope="module")
+def sample_excel_data():
+    """Sample Excel data for testing"""
+    return SAMPLE_EXCEL_DATA
+
+
+@pytest.fixture(scope="session")
+def sample_df(pd):
+    """Read-only sample DataFrame shared by every test; ExcelReader never mutates the frames it reads"""
+    return pd.DataFrame(SAMPLE_EXCEL_DATA)
 
 
 class TestExcelReader:
     """Test ExcelReader utility class"""
 
-    @pytest.fixture
-    def excel_reader(self):
-        """Create ExcelReader instance"""
-        return ExcelReader()
-
-    @pytest.fixture
-    def sample_excel_data(self):
-        """Create sample Excel data for testing"""
-        return {
-            'wine_name': ['Chateau Margaux', 'Opus One', 'Sassicaia'],
-            'wine_id': ['CM001', 'OP001', 'SA001'],
-            'wine_type': ['Red', 'Red', 'Red'],
-            'region': ['Bordeaux', 'Napa Valley', 'Tuscany'],
-            'price_ref': [1000.0, 350.0, 250.0],
-            'vintage': [2015, 2018, 2016]
-        }
-
-    @pytest.fixture
-    def sample_df(self, sample_excel_data):
-        """Create sample DataFrame"""
-        return pd.DataFrame(sample_excel_data)
+    @pytest.fixture(autouse=True)
+    def _patch_read_excel(self, monkeypatch, pd, sample_df):
+        """Serve sample_df from pandas.read_excel; tests pass io.BytesIO() so the path existence check is skipped"""
+        monkeypatch.setattr(pd, "read_excel", lambda *args, **kwargs: sample_df)
 
     def test_excel_reader_initialization(self, excel_reader):
         """Test ExcelReader initialization"""
         assert excel_reader is not None
-        assert hasattr(excel_reader, 'read_excel_data')
-        assert hasattr(excel_reader, 'get_excel_columns')
-        assert hasattr(excel_reader, 'get_statistics')
+        missing = {'read_excel_data', 'get_excel_columns', 'get_statistics'} - set(dir(excel_reader))
+        assert not missing, missing
 
-    @patch('pandas.read_excel')
-    def test_read_excel_data_success(self, mock_read_excel, excel_reader, sample_df):
+    def test_read_excel_data_success(self, excel_reader):
         """Test successful Excel data reading"""
-        # Setup mock
-        mock_read_excel.return_value = sample_df
-
         # Execute
-        result = excel_reader.read_excel_data('test_file.xlsx')
+        result = excel_reader.read_excel_data(io.BytesIO())
 
         # Verify
         assert isinstance(result, list)
         assert len(result) == 3
         assert result[0]['wine_name'] == 'Chateau Margaux'
-        mock_read_excel.assert_called_once_with('test_file.xlsx')
 
-    @patch('pandas.read_excel')
-    def test_read_excel_data_file_not_found(self, mock_read_excel, excel_reader):
+    def test_read_excel_data_file_not_found(self, excel_reader):
         """Test reading Excel file that doesn't exist"""
         with pytest.raises(FileNotFoundError, match="Excel file not found"):
             excel_reader.read_excel_data('nonexistent.xlsx')
 
-    @patch('pandas.read_excel')
-    def test_get_excel_columns_success(self, mock_read_excel, excel_reader, sample_df):
+    def test_get_excel_columns_success(self, excel_reader):
         """Test getting Excel columns"""
-        # Setup mock
-        mock_read_excel.return_value = sample_df
-
         # Execute
-        result = excel_reader.get_excel_columns('test_file.xlsx')
+        result = excel_reader.get_excel_columns(io.BytesIO())
 
         # Verify
         assert isinstance(result, list)
         assert 'wine_name' in result
         assert 'wine_id' in result
         assert 'region' in result
-        mock_read_excel.assert_called_once_with('test_file.xlsx')
 
     def test_get_excel_columns_file_not_found(self, excel_reader):
         """Test getting columns from non-existent file"""
         with pytest.raises(FileNotFoundError, match="Excel file not found"):
             excel_reader.get_excel_columns('nonexistent.xlsx')
 
-    @patch('pandas.read_excel')
-    def test_get_sample_data(self, mock_read_excel, excel_reader, sample_df):
+    def test_get_sample_data(self, excel_reader):
         """Test getting sample data"""
-        # Setup mock
-        mock_read_excel.return_value = sample_df
-
         # Execute
-        result = excel_reader.get_sample_data('test_file.xlsx', sample_size=2)
+        result = excel_reader.get_sample_data(io.BytesIO(), sample_size=2)
 
         # Verify
         assert isinstance(result, list)
         assert len(result) == 2
         assert result[0]['wine_name'] == 'Chateau Margaux'
 
-    @patch('pandas.read_excel')
-    def test_get_wine_ids(self, mock_read_excel, excel_reader, sample_df):
+    def test_get_wine_ids(self, excel_reader):
         """Test getting wine IDs"""
-        # Setup mock
-        mock_read_excel.return_value = sample_df
-
         # Execute
-        result = excel_reader.get_wine_ids('test_file.xlsx')
+        result = excel_reader.get_wine_ids(io.BytesIO())
 
         # Verify
         assert isinstance(result, list)
@@ -115,8 +109,7 @@ class TestExcelReader:
         assert 'OP001' in result
         assert 'SA001' in result
 
-    @patch('pandas.read_excel')
-    def test_filter_by_wine_type(self, mock_read_excel, excel_reader, sample_df):
+    def test_filter_by_wine_type(self, excel_reader, monkeypatch, pd):
         """Test filtering by wine type"""
         # Setup mock with different wine types
         mixed_df = pd.DataFrame({
@@ -124,18 +117,17 @@ class TestExcelReader:
             'wine_type': ['Red', 'White', 'Red'],
             'region': ['Region1', 'Region2', 'Region3']
         })
-        mock_read_excel.return_value = mixed_df
+        monkeypatch.setattr(pd, "read_excel", lambda *args, **kwargs: mixed_df)
 
         # Execute
-        result = excel_reader.filter_by_wine_type('test_file.xlsx', 'Red')
+        result = excel_reader.filter_by_wine_type(io.BytesIO(), 'Red')
 
         # Verify
         assert isinstance(result, list)
         assert len(result) == 2
         assert all(item['wine_type'] == 'Red' for item in result)
 
-    @patch('pandas.read_excel')
-    def test_filter_by_region(self, mock_read_excel, excel_reader, sample_df):
+    def test_filter_by_region(self, excel_reader, monkeypatch, pd):
         """Test filtering by region"""
         # Setup mock with different regions
         mixed_df = pd.DataFrame({
@@ -143,64 +135,54 @@ class TestExcelReader:
             'wine_type': ['Red', 'Red', 'Red'],
             'region': ['Bordeaux', 'Bordeaux', 'Napa']
         })
-        mock_read_excel.return_value = mixed_df
+        monkeypatch.setattr(pd, "read_excel", lambda *args, **kwargs: mixed_df)
 
         # Execute
-        result = excel_reader.filter_by_region('test_file.xlsx', 'Bordeaux')
+        result = excel_reader.filter_by_region(io.BytesIO(), 'Bordeaux')
 
         # Verify
         assert isinstance(result, list)
         assert len(result) == 2
         assert all(item['region'] == 'Bordeaux' for item in result)
 
-    @patch('pandas.read_excel')
-    def test_get_statistics(self, mock_read_excel, excel_reader, sample_df):
+    def test_get_statistics(self, excel_reader):
         """Test getting statistics"""
-        # Setup mock
-        mock_read_excel.return_value = sample_df
-
         # Execute
-        result = excel_reader.get_statistics('test_file.xlsx')
+        result = excel_reader.get_statistics(io.BytesIO())
 
         # Verify
         assert isinstance(result, dict)
-        assert 'total_records' in result
-        assert 'columns' in result
-        assert 'wine_types' in result
-        assert 'regions' in result
         assert result['total_records'] == 3
-        assert len(result['columns']) > 0
+        assert result['columns'] == list(SAMPLE_EXCEL_DATA)
+        assert result['wine_types'] == {'Red': 3}
+        assert result['regions'] == {'Bordeaux': 1, 'Napa Valley': 1, 'Tuscany': 1}
+        assert result['vintage_range'] == {'min': 2015, 'max': 2018}
 
-    def test_get_statistics_empty_data(self, excel_reader):
+    def test_get_statistics_empty_data(self, excel_reader, monkeypatch, pd):
         """Test getting statistics with empty data"""
-        with patch.object(excel_reader, 'read_excel_data', return_value=[]):
-            result = excel_reader.get_statistics('test_file.xlsx')
-            assert result == {}
+        monkeypatch.setattr(pd, "read_excel", lambda *args, **kwargs: pd.DataFrame())
 
-    @patch('pandas.read_excel')
-    def test_validate_required_columns_success(self, mock_read_excel, excel_reader, sample_df):
+        result = excel_reader.get_statistics(io.BytesIO())
+        assert result == {}
+
+    def test_validate_required_columns_success(self, excel_reader):
         """Test successful column validation"""
-        # Setup mock
-        mock_read_excel.return_value = sample_df
         required_columns = ['wine_name', 'wine_id', 'region']
 
         # Execute
-        result = excel_reader.validate_required_columns('test_file.xlsx', required_columns)
+        result = excel_reader.validate_required_columns(io.BytesIO(), required_columns)
 
         # Verify
         assert isinstance(result, dict)
         assert result['is_valid'] is True
         assert len(result['missing_columns']) == 0
 
-    @patch('pandas.read_excel')
-    def test_validate_required_columns_missing(self, mock_read_excel, excel_reader, sample_df):
+    def test_validate_required_columns_missing(self, excel_reader):
         """Test column validation with missing columns"""
-        # Setup mock
-        mock_read_excel.return_value = sample_df
         required_columns = ['wine_name', 'missing_column', 'another_missing']
 
         # Execute
-        result = excel_reader.validate_required_columns('test_file.xlsx', required_columns)
+        result = excel_reader.validate_required_columns(io.BytesIO(), required_columns)
 
         # Verify
         assert isinstance(result, dict)
@@ -208,91 +190,112 @@ class TestExcelReader:
         assert 'missing_column' in result['missing_columns']
         assert 'another_missing' in result['missing_columns']
 
+    def test_validate_required_columns_reads_header_only(self, excel_reader, monkeypatch, sample_df, pd):
+        """Test column validation only reads the header row"""
+        calls = []
+
+        def read_header(*args, **kwargs):
+            calls.append(kwargs)
+            return sample_df.iloc[:0]
+        monkeypatch.setattr(pd, "read_excel", read_header)
+
+        result = excel_reader.validate_required_columns(io.BytesIO(), ['region', 'missing_column', 'wine_id'])
+
+        assert result['missing_columns'] == ['missing_column']
+        assert calls == [{'nrows': 0}]
+
     def test_validate_required_columns_file_not_found(self, excel_reader):
         """Test column validation with non-existent file"""
         with pytest.raises(FileNotFoundError, match="Excel file not found"):
             excel_reader.validate_required_columns('nonexistent.xlsx', ['col1'])
 
-    def test_create_and_read_excel_file_integration(self, excel_reader, sample_excel_data):
-        """Integration test: create and read an Excel file"""
-        # Create temporary Excel file
-        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp_file:
-            # Create DataFrame and save to Excel
-            df = pd.DataFrame(sample_excel_data)
-            df.to_excel(tmp_file.name, index=False)
-
-            try:
-                # Test reading data
-                data = excel_reader.read_excel_data(tmp_file.name)
-                assert len(data) == 3
-                assert data[0]['wine_name'] == 'Chateau Margaux'
-
-                # Test getting columns
-                columns = excel_reader.get_excel_columns(tmp_file.name)
-                assert 'wine_name' in columns
-                assert 'wine_id' in columns
-
-                # Test getting wine IDs
-                wine_ids = excel_reader.get_wine_ids(tmp_file.name)
-                assert 'CM001' in wine_ids
-
-                # Test statistics
-                stats = excel_reader.get_statistics(tmp_file.name)
-                assert stats['total_records'] == 3
-
-                # Test column validation
-                validation = excel_reader.validate_required_columns(
-                    tmp_file.name, ['wine_name', 'wine_id']
-                )
-                assert validation['is_valid'] is True
-
-            finally:
-                # Clean up
-                os.unlink(tmp_file.name)
-
-    def test_case_sensitivity_in_filters(self, excel_reader):
+    def test_case_sensitivity_in_filters(self, excel_reader, monkeypatch, pd):
         """Test that filters are case insensitive"""
-        with patch.object(excel_reader, 'read_excel_data', return_value=[
-            {'wine_type': 'Red', 'region': 'Bordeaux'},
-            {'wine_type': 'RED', 'region': 'NAPA'},
-            {'wine_type': 'red', 'region': 'bordeaux'}
-        ]):
-            # Test wine type filter (case insensitive)
-            result = excel_reader.filter_by_wine_type('test.xlsx', 'RED')
-            assert len(result) == 3  # Should match all case variations
-
-            # Test region filter (case insensitive)
-            result = excel_reader.filter_by_region('test.xlsx', 'BORDEAUX')
-            assert len(result) == 2  # Should match both 'Bordeaux' and 'bordeaux'
-
-    def test_error_handling_in_read_methods(self, excel_reader):
+        case_df = pd.DataFrame({
+            'wine_type': ['Red', 'RED', 'red'],
+            'region': ['Bordeaux', 'NAPA', 'bordeaux']
+        })
+        monkeypatch.setattr(pd, "read_excel", lambda *args, **kwargs: case_df)
+
+        # Test wine type filter (case insensitive)
+        result = excel_reader.filter_by_wine_type(io.BytesIO(), 'RED')
+        assert len(result) == 3  # Should match all case variations
+
+        # Test region filter (case insensitive)
+        result = excel_reader.filter_by_region(io.BytesIO(), 'BORDEAUX')
+        assert len(result) == 2  # Should match both 'Bordeaux' and 'bordeaux'
+        assert [row['region'] for row in result] == ['Bordeaux', 'bordeaux']
+
+    def test_error_handling_in_read_methods(self, excel_reader, pd):
         """Test error handling in read methods"""
         # Test pandas error
         with patch('pandas.read_excel', side_effect=pd.errors.EmptyDataError("Empty file")):
             with pytest.raises(pd.errors.EmptyDataError):
-                excel_reader.read_excel_data('empty.xlsx')
+                excel_reader.read_excel_data(io.BytesIO())
 
         # Test permission error
         with patch('pandas.read_excel', side_effect=PermissionError("Access denied")):
             with pytest.raises(PermissionError):
-                excel_reader.read_excel_data('/restricted/file.xlsx')
+                excel_reader.read_excel_data(io.BytesIO())
+
+
+class TestExcelReaderIntegration:
+    """Round-trip a real workbook through ExcelReader (pandas.read_excel not stubbed)"""
+
+    @pytest.mark.slow
+    @pytest.mark.serial
+    def test_create_and_read_excel_file_integration(self, excel_reader, sample_excel_data, pd):
+        """Integration test: create and read an Excel file"""
+        # Write the workbook to memory instead of a temporary file on disk
+        workbook = io.BytesIO()
+        pd.DataFrame(sample_excel_data).to_excel(workbook, index=False, engine="openpyxl")
+        workbook.seek(0)
+
+        # Test reading data
+        data = excel_reader.read_excel_data(workbook)
+        assert len(data) == 3
+        assert data[0]['wine_name'] == 'Chateau Margaux'
+
+        # Test getting columns
+        columns = excel_reader.get_excel_columns(workbook)
+        assert 'wine_name' in columns
+        assert 'wine_id' in columns
+
+        # Test getting wine IDs
+        wine_ids = excel_reader.get_wine_ids(workbook)
+        assert 'CM001' in wine_ids
+
+        # Test statistics
+        stats = excel_reader.get_statistics(workbook)
+        assert stats['total_records'] == 3
+
+        # Test column validation
+        validation = excel_reader.validate_required_columns(
+            workbook, ['wine_name', 'wine_id']
+        )
+        assert validation['is_valid'] is True
 
 
 class TestPerformance:
     """Test performance scenarios"""
 
-    def test_large_dataset_performance(self, excel_reader):
+    def test_large_dataset_performance(self, excel_reader, pd):
         """Test handling of larger datasets"""
-        # Create large dataset mock
-        large_data = [{'wine_name': f'Wine {i}', 'wine_id': f'ID{i}'} for i in range(1000)]
+        import numpy as np
+
+        # Create large dataset mock (columns built vectorised, rows materialised once)
+        ids = pd.Series(np.arange(1000)).astype(str)
+        large_df = pd.DataFrame({'wine_name': 'Wine ' + ids, 'wine_id': 'ID' + ids})
+        large_file = io.BytesIO()
 
-        with patch.object(excel_reader, 'read_excel_data', return_value=large_data):
+        with patch('pandas.read_excel', return_value=large_df):
             # Test that methods can handle large datasets
-            result = excel_reader.get_sample_data('large_file.xlsx', sample_size=10)
+            result = excel_reader.get_sample_data(large_file, sample_size=10)
             assert len(result) == 10
 
-            wine_ids = excel_reader.get_wine_ids('large_file.xlsx')
+            wine_ids = excel_reader.get_wine_ids(large_file)
             assert len(wine_ids) == 1000
 
-            stats = excel_reader.get_statistics('large_file.xlsx')
-            assert stats['total_records'] == 1000
\ No newline at end of file
+            stats = excel_reader.get_statistics(large_file)
+            assert stats['total_records'] == 1000
+            assert stats['wine_types'] == {'Unknown': 1000}
\ No newline at end of file